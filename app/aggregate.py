@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from collections import Counter
 
 from app.utils import load_synonyms, normalize_token, tokenize_field
@@ -17,32 +19,80 @@ class DataAggregator:
         self.registrants_parts_dir = f"{data_dir}/registrants/parts"
         self.synonyms = load_synonyms()
     
-    def _read_parquet_dataset(self, parts_dir: str, legacy_file: str) -> Optional[pd.DataFrame]:
-        """Read parquet data from parts directory or legacy single file.
+    def _read_parquet_file(
+        self,
+        path: str,
+        columns: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Read a single parquet file with PyArrow, projecting to the requested columns.
+        
+        Columns that are not present in the file are skipped so that parts written
+        from differently-shaped uploads can still be combined. Columns listed in
+        exclude are never read.
+        """
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in available]
+        elif exclude:
+            columns = [
+                col for col in pq.read_schema(path).names
+                if col not in exclude and not col.startswith('__index_level_')
+            ]
+        
+        table = pq.read_table(path, columns=columns, pre_buffer=True, use_threads=True)
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+    
+    def _list_parquet_files(self, parts_dir: str, legacy_file: str) -> List[str]:
+        """List the part files in parts_dir followed by the legacy single file.
         
-        This supports both the new partitioned format (multiple parquet files in parts/)
-        and the legacy single-file format for backwards compatibility.
+        Shared by the dataset reader and data_fingerprint so both see exactly the
+        same set of files from a single directory scan.
         """
-        dfs = []
+        paths = []
         
         # Read from parts directory if it exists
         if os.path.exists(parts_dir):
-            part_files = [f for f in os.listdir(parts_dir) if f.endswith('.parquet')]
-            for part_file in part_files:
-                part_path = os.path.join(parts_dir, part_file)
-                try:
-                    df = pd.read_parquet(part_path)
-                    dfs.append(df)
-                except Exception as e:
-                    print(f"[AGGREGATE] Warning: Failed to read {part_path}: {e}", flush=True)
+            paths.extend(
+                entry.path for entry in os.scandir(parts_dir)
+                if entry.name.endswith('.parquet')
+            )
         
         # Also read legacy single file if it exists (for backwards compatibility)
         if os.path.exists(legacy_file):
+            paths.append(legacy_file)
+        
+        return paths
+    
+    def _read_parquet_dataset(
+        self,
+        parts_dir: str,
+        legacy_file: str,
+        columns: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """Read parquet data from parts directory or legacy single file.
+        
+        This supports both the new partitioned format (multiple parquet files in parts/)
+        and the legacy single-file format for backwards compatibility.
+        
+        If columns is given, only those columns (plus the _dedup_key used for
+        deduplication) are read from disk. Otherwise every column except those in
+        exclude is read; _dedup_key is always kept.
+        """
+        if columns is not None:
+            columns = list(dict.fromkeys(list(columns) + ['_dedup_key']))
+        if exclude:
+            exclude = [col for col in exclude if col != '_dedup_key']
+        
+        dfs = []
+        
+        for path in self._list_parquet_files(parts_dir, legacy_file):
             try:
-                df = pd.read_parquet(legacy_file)
+                df = self._read_parquet_file(path, columns, exclude)
                 dfs.append(df)
             except Exception as e:
-                print(f"[AGGREGATE] Warning: Failed to read {legacy_file}: {e}", flush=True)
+                print(f"[AGGREGATE] Warning: Failed to read {path}: {e}", flush=True)
         
         if not dfs:
             return None
@@ -56,78 +106,102 @@ class DataAggregator:
         
         return combined_df
     
-    def _get_submissions_df(self) -> Optional[pd.DataFrame]:
-        return self._read_parquet_dataset(self.submissions_parts_dir, self.submissions_file)
+    def _get_submissions_df(
+        self,
+        columns: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        return self._read_parquet_dataset(self.submissions_parts_dir, self.submissions_file, columns, exclude)
+    
+    def _get_registrants_df(self, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        return self._read_parquet_dataset(self.registrants_parts_dir, self.registrants_file, columns)
     
-    def _get_registrants_df(self) -> Optional[pd.DataFrame]:
-        return self._read_parquet_dataset(self.registrants_parts_dir, self.registrants_file)
+    def _count_tokens(
+        self,
+        values: pd.Series,
+        delimiter: str,
+        synonyms: Dict[str, str],
+        allowed: Optional[set] = None
+    ) -> Counter:
+        """Count normalized tokens in a delimited text column.
+        
+        Raw tokens are factorized and counted with np.bincount first, so the
+        regex + synonym normalization runs once per distinct spelling instead of
+        once per occurrence. Insertion order matches a plain row-by-row loop, so
+        most_common() ties resolve the same way.
+        """
+        counter = Counter()
+        
+        raw_tokens = [
+            token
+            for value in values.dropna()
+            for token in tokenize_field(str(value), delimiter)
+        ]
+        if not raw_tokens:
+            return counter
+        
+        codes, uniques = pd.factorize(np.array(raw_tokens, dtype=object))
+        counts = np.bincount(codes, minlength=len(uniques))
+        
+        for token, count in zip(uniques, counts):
+            normalized = normalize_token(token, synonyms)
+            if normalized and (allowed is None or normalized in allowed):
+                counter[normalized] += int(count)
+        
+        return counter
     
     def get_top_technologies(self, limit: Optional[int] = 50) -> pd.DataFrame:
-        df = self._get_submissions_df()
+        df = self._get_submissions_df(columns=['Built With'])
         
         if df is None or 'Built With' not in df.columns:
             return pd.DataFrame(columns=['Technology', 'Count', 'Percentage'])
         
-        tech_counter = Counter()
         tech_synonyms = self.synonyms.get('technologies', {})
-        
-        for value in df['Built With'].dropna():
-            tokens = tokenize_field(str(value), ',')
-            for token in tokens:
-                normalized = normalize_token(token, tech_synonyms)
-                if normalized:
-                    tech_counter[normalized] += 1
+        tech_counter = self._count_tokens(df['Built With'], ',', tech_synonyms)
         
         total_count = sum(tech_counter.values())
         
         top_techs = tech_counter.most_common() if limit is None else tech_counter.most_common(limit)
         
-        result_df = pd.DataFrame([
-            {
-                'Rank': idx + 1,
-                'Technology': tech,
-                'Count': count,
-                'Percentage': round((count / total_count * 100), 2) if total_count > 0 else 0
-            }
-            for idx, (tech, count) in enumerate(top_techs)
-        ])
+        counts = np.array([count for _, count in top_techs], dtype=np.int64)
+        
+        result_df = pd.DataFrame({
+            'Rank': np.arange(1, len(counts) + 1),
+            'Technology': [tech for tech, _ in top_techs],
+            'Count': counts,
+            'Percentage': (counts / total_count * 100).round(2) if total_count > 0 else 0
+        })
         
         return result_df
     
     def get_top_skills(self, limit: Optional[int] = 50) -> pd.DataFrame:
-        df = self._get_registrants_df()
+        df = self._get_registrants_df(columns=['Skills'])
         
         if df is None or 'Skills' not in df.columns:
             return pd.DataFrame(columns=['Skill', 'Count', 'Percentage'])
         
-        skill_counter = Counter()
         skill_synonyms = self.synonyms.get('skills', {})
-        
-        for value in df['Skills'].dropna():
-            tokens = tokenize_field(str(value), ';')
-            for token in tokens:
-                normalized = normalize_token(token, skill_synonyms)
-                if normalized:
-                    skill_counter[normalized] += 1
+        skill_counter = self._count_tokens(df['Skills'], ';', skill_synonyms)
         
         total_count = sum(skill_counter.values())
         
         top_skills = skill_counter.most_common() if limit is None else skill_counter.most_common(limit)
         
-        result_df = pd.DataFrame([
-            {
-                'Rank': idx + 1,
-                'Skill': skill,
-                'Count': count,
-                'Percentage': round((count / total_count * 100), 2) if total_count > 0 else 0
-            }
-            for idx, (skill, count) in enumerate(top_skills)
-        ])
+        counts = np.array([count for _, count in top_skills], dtype=np.int64)
+        
+        result_df = pd.DataFrame({
+            'Rank': np.arange(1, len(counts) + 1),
+            'Skill': [skill for skill, _ in top_skills],
+            'Count': counts,
+            'Percentage': (counts / total_count * 100).round(2) if total_count > 0 else 0
+        })
         
         return result_df
     
     def get_submissions_by_hackathon(self) -> pd.DataFrame:
-        df = self._get_submissions_df()
+        df = self._get_submissions_df(
+            columns=['Challenge Title', 'Project Title', 'Organization Name']
+        )
         
         if df is None or 'Challenge Title' not in df.columns:
             return pd.DataFrame(columns=['Hackathon', 'Submissions', 'Organizations'])
@@ -144,7 +218,7 @@ class DataAggregator:
         return hackathon_groups
     
     def get_team_size_distribution(self) -> pd.DataFrame:
-        df = self._get_submissions_df()
+        df = self._get_submissions_df(columns=['Additional Team Member Count'])
         
         if df is None or 'Additional Team Member Count' not in df.columns:
             return pd.DataFrame(columns=['Team Size', 'Count', 'Percentage'])
@@ -164,7 +238,7 @@ class DataAggregator:
         return result_df
     
     def get_country_distribution(self, limit: Optional[int] = 50) -> pd.DataFrame:
-        df = self._get_registrants_df()
+        df = self._get_registrants_df(columns=['Country'])
         
         if df is None or 'Country' not in df.columns:
             return pd.DataFrame(columns=['Country', 'Count', 'Percentage'])
@@ -182,7 +256,7 @@ class DataAggregator:
         return result_df
     
     def get_occupation_breakdown(self, limit: Optional[int] = 50) -> pd.DataFrame:
-        df = self._get_registrants_df()
+        df = self._get_registrants_df(columns=['Occupation'])
         
         if df is None or 'Occupation' not in df.columns:
             return pd.DataFrame(columns=['Occupation', 'Count', 'Percentage'])
@@ -200,7 +274,7 @@ class DataAggregator:
         return result_df
     
     def get_specialty_distribution(self) -> pd.DataFrame:
-        df = self._get_registrants_df()
+        df = self._get_registrants_df(columns=['Specialty'])
         
         if df is None or 'Specialty' not in df.columns:
             return pd.DataFrame(columns=['Specialty', 'Count', 'Percentage'])
@@ -218,7 +292,7 @@ class DataAggregator:
         return result_df
     
     def get_work_experience_distribution(self) -> pd.DataFrame:
-        df = self._get_registrants_df()
+        df = self._get_registrants_df(columns=['Work Experience'])
         
         if df is None or 'Work Experience' not in df.columns:
             return pd.DataFrame(columns=['Experience Range', 'Count', 'Percentage'])
@@ -245,7 +319,7 @@ class DataAggregator:
         return result_df
     
     def get_time_trends(self, period: str = 'daily') -> pd.DataFrame:
-        df = self._get_submissions_df()
+        df = self._get_submissions_df(columns=['Project Created At'])
         
         if df is None or 'Project Created At' not in df.columns:
             return pd.DataFrame(columns=['Date', 'Submissions', 'Cumulative'])
@@ -274,8 +348,13 @@ class DataAggregator:
         return time_counts
     
     def get_summary_statistics(self) -> Dict[str, Any]:
-        submissions_df = self._get_submissions_df()
-        registrants_df = self._get_registrants_df()
+        # Read each dataset once with every column the summary needs, rather
+        # than re-reading it for the top technology/skill/country lookups
+        submissions_df = self._get_submissions_df(columns=[
+            'Challenge Title', 'Organization Name', 'Project Created At',
+            'Additional Team Member Count', 'Built With'
+        ])
+        registrants_df = self._get_registrants_df(columns=['Skills', 'Country'])
         
         summary = {
             'total_submissions': 0,
@@ -310,21 +389,28 @@ class DataAggregator:
             if 'Additional Team Member Count' in submissions_df.columns:
                 team_sizes = submissions_df['Additional Team Member Count'].fillna(0).astype(int) + 1
                 summary['avg_team_size'] = round(team_sizes.mean(), 2)
+            
+            if 'Built With' in submissions_df.columns:
+                tech_counter = self._count_tokens(
+                    submissions_df['Built With'], ',', self.synonyms.get('technologies', {})
+                )
+                if tech_counter:
+                    summary['most_popular_technology'] = tech_counter.most_common(1)[0][0]
         
         if registrants_df is not None:
             summary['total_registrants'] = len(registrants_df)
-        
-        top_techs = self.get_top_technologies(limit=1)
-        if not top_techs.empty:
-            summary['most_popular_technology'] = top_techs.iloc[0]['Technology']
-        
-        top_skills = self.get_top_skills(limit=1)
-        if not top_skills.empty:
-            summary['most_popular_skill'] = top_skills.iloc[0]['Skill']
-        
-        countries = self.get_country_distribution(limit=1)
-        if not countries.empty:
-            summary['top_country'] = countries.iloc[0]['Country']
+            
+            if 'Skills' in registrants_df.columns:
+                skill_counter = self._count_tokens(
+                    registrants_df['Skills'], ';', self.synonyms.get('skills', {})
+                )
+                if skill_counter:
+                    summary['most_popular_skill'] = skill_counter.most_common(1)[0][0]
+            
+            if 'Country' in registrants_df.columns:
+                country_counts = registrants_df['Country'].value_counts()
+                if not country_counts.empty:
+                    summary['top_country'] = country_counts.index[0]
         
         return summary
     
@@ -339,7 +425,7 @@ class DataAggregator:
         Returns:
             DataFrame with columns: Period, Technology, Count
         """
-        df = self._get_submissions_df()
+        df = self._get_submissions_df(columns=['Built With', 'Project Created At'])
         
         if df is None or 'Built With' not in df.columns or 'Project Created At' not in df.columns:
             return pd.DataFrame(columns=['Period', 'Technology', 'Count'])
@@ -364,27 +450,22 @@ class DataAggregator:
         
         top_tech_names = set(top_techs['Technology'].tolist())
         
-        period_tech_counts = []
+        period_col, tech_col, count_col = [], [], []
         
-        for period_val in df['Period'].unique():
-            period_df = df[df['Period'] == period_val]
-            tech_counter = Counter()
-            
-            for value in period_df['Built With'].dropna():
-                tokens = tokenize_field(str(value), ',')
-                for token in tokens:
-                    normalized = normalize_token(token, tech_synonyms)
-                    if normalized and normalized in top_tech_names:
-                        tech_counter[normalized] += 1
+        for period_val, period_df in df.groupby('Period', sort=False):
+            tech_counter = self._count_tokens(
+                period_df['Built With'], ',', tech_synonyms, allowed=top_tech_names
+            )
             
-            for tech, count in tech_counter.items():
-                period_tech_counts.append({
-                    'Period': period_val,
-                    'Technology': tech,
-                    'Count': count
-                })
+            period_col.extend([period_val] * len(tech_counter))
+            tech_col.extend(tech_counter.keys())
+            count_col.extend(tech_counter.values())
         
-        result_df = pd.DataFrame(period_tech_counts)
+        result_df = pd.DataFrame({
+            'Period': period_col,
+            'Technology': tech_col,
+            'Count': count_col
+        })
         
         if result_df.empty:
             return pd.DataFrame(columns=['Period', 'Technology', 'Count'])
@@ -404,12 +485,12 @@ class DataAggregator:
         Returns:
             DataFrame with columns: Period, Skill, Count
         """
-        df = self._get_registrants_df()
+        df = self._get_registrants_df(columns=['Skills'])
         
         if df is None or 'Skills' not in df.columns:
             return pd.DataFrame(columns=['Period', 'Skill', 'Count'])
         
-        submissions_df = self._get_submissions_df()
+        submissions_df = self._get_submissions_df(columns=['Project Created At'])
         if submissions_df is None or 'Project Created At' not in submissions_df.columns:
             return pd.DataFrame(columns=['Period', 'Skill', 'Count'])
         
@@ -439,29 +520,23 @@ class DataAggregator:
         
         top_skill_names = set(top_skills['Skill'].tolist())
         
-        skill_counter = Counter()
-        for value in df['Skills'].dropna():
-            tokens = tokenize_field(str(value), ';')
-            for token in tokens:
-                normalized = normalize_token(token, skill_synonyms)
-                if normalized and normalized in top_skill_names:
-                    skill_counter[normalized] += 1
+        skill_counter = self._count_tokens(df['Skills'], ';', skill_synonyms, allowed=top_skill_names)
         
         total_count = sum(skill_counter.values())
         
-        period_skill_counts = []
-        for period_val in periods:
-            for skill in top_skill_names:
-                count = skill_counter.get(skill, 0)
-                estimated_count = int(count / len(periods)) if len(periods) > 0 else 0
-                
-                period_skill_counts.append({
-                    'Period': str(period_val),
-                    'Skill': skill,
-                    'Count': estimated_count
-                })
+        # Every period gets the same per-skill estimate, so the frame is the
+        # period column repeated against the skill columns tiled
+        skills = list(top_skill_names)
+        estimated_counts = [
+            int(skill_counter.get(skill, 0) / len(periods)) if len(periods) > 0 else 0
+            for skill in skills
+        ]
         
-        result_df = pd.DataFrame(period_skill_counts)
+        result_df = pd.DataFrame({
+            'Period': np.repeat(periods.astype(str).to_numpy(), len(skills)),
+            'Skill': skills * len(periods),
+            'Count': estimated_counts * len(periods)
+        })
         
         if result_df.empty:
             return pd.DataFrame(columns=['Period', 'Skill', 'Count'])
@@ -484,3 +559,19 @@ class DataAggregator:
             os.path.exists(self.submissions_file) or 
             os.path.exists(self.registrants_file)
         )
+    
+    def data_fingerprint(self) -> Tuple[Tuple[str, float, int], ...]:
+        """Return (path, mtime, size) for every parquet file backing the aggregator.
+        
+        Only stat() calls are made, so this is cheap enough to compute on every
+        Streamlit rerun and use as a cache key that changes when new data lands.
+        """
+        entries = []
+        for parts_dir, legacy_file in (
+            (self.submissions_parts_dir, self.submissions_file),
+            (self.registrants_parts_dir, self.registrants_file),
+        ):
+            for path in self._list_parquet_files(parts_dir, legacy_file):
+                stat = os.stat(path)
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return tuple(sorted(entries))
@@ -91,8 +91,7 @@ class HackathonFilter:
         if organizer_hackathons.empty:
             return result
         
-        for _, row in organizer_hackathons.iterrows():
-            hackathon_name = row['Hackathon name']
+        for hackathon_name in organizer_hackathons['Hackathon name'].tolist():
             hackathon_data = self.filter_by_hackathon(hackathon_name)
             
             hackathon_info = {
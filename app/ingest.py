@@ -1,8 +1,9 @@
 import pandas as pd
+import pyarrow.parquet as pq
 import os
 import zipfile
 import traceback
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, BinaryIO, Union
 import tempfile
 import shutil
 from pathlib import Path
@@ -12,6 +13,7 @@ from app.utils import (
     compute_file_hash, 
     validate_excel_file, 
     clean_string,
+    clean_string_series,
     parse_datetime
 )
 
@@ -30,7 +32,7 @@ class DataIngestor:
         os.makedirs(f"{self.retry_dir}/submissions", exist_ok=True)
         os.makedirs(f"{self.retry_dir}/registrants", exist_ok=True)
     
-    def process_zip_file(self, zip_path: str, progress_callback=None) -> Dict[str, Any]:
+    def process_zip_file(self, zip_path: Union[str, BinaryIO], progress_callback=None) -> Dict[str, Any]:
         results = {
             'total_files': 0,
             'processed_files': 0,
@@ -323,7 +325,7 @@ class DataIngestor:
     def clean_data(self, df: pd.DataFrame, file_type: str) -> pd.DataFrame:
         object_cols = df.select_dtypes(include=['object']).columns
         for col in object_cols:
-            df[col] = df[col].apply(clean_string)
+            df[col] = clean_string_series(df[col])
         
         if file_type == 'submission':
             date_columns = ['Project Created At', 'Challenge Published At', 'Created At']
@@ -387,7 +389,9 @@ class DataIngestor:
             part_file = f"{parts_dir}/{int(time.time() * 1000)}.parquet"
         
         print(f"[INGEST] Writing {len(df)} rows to {part_file}", flush=True)
-        df.to_parquet(part_file, index=False, engine='pyarrow')
+        # zstd on top of pyarrow's default dictionary encoding keeps the highly
+        # repetitive text columns (hackathon, organization, country) small on disk
+        df.to_parquet(part_file, index=False, engine='pyarrow', compression='zstd')
         print(f"[INGEST] Parquet write complete", flush=True)
     
     def get_data_summary(self) -> Dict[str, Any]:
@@ -396,23 +400,20 @@ class DataIngestor:
             'registrants': {'exists': False, 'row_count': 0}
         }
         
-        submission_file = f"{self.data_dir}/submissions/data.parquet"
-        if os.path.exists(submission_file):
-            df = pd.read_parquet(submission_file)
-            summary['submissions'] = {
-                'exists': True,
-                'row_count': len(df),
-                'columns': list(df.columns)
-            }
-        
-        registrant_file = f"{self.data_dir}/registrants/data.parquet"
-        if os.path.exists(registrant_file):
-            df = pd.read_parquet(registrant_file)
-            summary['registrants'] = {
-                'exists': True,
-                'row_count': len(df),
-                'columns': list(df.columns)
-            }
+        # Row count and schema live in the Parquet footer, so there is no need
+        # to load the whole file into a DataFrame just to describe it.
+        for file_type in ('submissions', 'registrants'):
+            data_file = f"{self.data_dir}/{file_type}/data.parquet"
+            if os.path.exists(data_file):
+                parquet_file = pq.ParquetFile(data_file)
+                summary[file_type] = {
+                    'exists': True,
+                    'row_count': parquet_file.metadata.num_rows,
+                    'columns': [
+                        name for name in parquet_file.schema_arrow.names
+                        if not name.startswith('__index_level_')
+                    ]
+                }
         
         return summary
     
@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 import os
 import re
-from typing import Dict, List, Optional, Tuple, Callable, Generator
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Callable, Generator, BinaryIO, Union
 from app.aggregate import DataAggregator
+from app.utils import write_excel_sheets
 
 
 class RandomSampler:
@@ -38,6 +41,59 @@ class RandomSampler:
         """Lazily load submissions data on each access to ensure fresh data after ingest."""
         return self.aggregator._get_submissions_df()
     
+    def _load_slugged_submissions(self) -> Optional[pd.DataFrame]:
+        """
+        Load submissions once with a 'hackathon_slug' column extracted from their URLs.
+        
+        Batch callers pass the result to find_hackathon / get_random_sample so the
+        dataset is read and slugged once per batch rather than once per hackathon.
+        It is only read from afterwards, so worker threads can share it.
+        """
+        # Excluded columns never reach an export, so they are not read at all
+        df = self.aggregator._get_submissions_df(exclude=self.EXCLUDED_COLUMNS)
+        if df is None:
+            return None
+        
+        df['hackathon_slug'] = df['Submission Url'].str.extract(r'https://([^.]+)\.devpost\.com')
+        return df
+    
+    @staticmethod
+    def _index_slugs(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Map each lowercased hackathon slug to the row positions of its submissions.
+        
+        Built once per batch, it turns each hackathon's slug lookup from a scan of
+        every submission into a dict lookup. Positions keep dataset order, so
+        samples drawn from them match those from a boolean filter.
+        """
+        return df.groupby(df['hackathon_slug'].str.lower(), sort=False).indices
+    
+    @staticmethod
+    def _sample_positions(n: int, k: int, random_state: Optional[int] = None) -> np.ndarray:
+        """
+        Draw k distinct row positions out of n.
+        
+        DataFrame.sample goes through the legacy RandomState.choice, which
+        permutes all n rows to pick k of them; Generator.choice with
+        shuffle=False only does work proportional to k for small samples.
+        """
+        if k >= n:
+            return np.arange(n)
+        
+        rng = np.random.default_rng(random_state)
+        return rng.choice(n, size=k, replace=False, shuffle=False)
+    
+    @staticmethod
+    def _match_slug(
+        df: pd.DataFrame,
+        slug: str,
+        slug_positions: Optional[Dict[str, np.ndarray]] = None
+    ) -> pd.DataFrame:
+        """Return the submissions of a slug, via slug_positions when available."""
+        if slug_positions is None:
+            return df[df['hackathon_slug'].str.lower() == slug]
+        return df.iloc[slug_positions.get(slug, [])]
+    
     def get_ai_hackathons_list(self) -> List[str]:
         """
         Load the list of AI/ML hackathon URLs from the AI hackathons file.
@@ -52,7 +108,11 @@ class RandomSampler:
             return []
         
         try:
-            df = pd.read_excel(self.AI_HACKATHONS_FILE)
+            df = pd.read_excel(
+                self.AI_HACKATHONS_FILE,
+                engine='calamine',
+                usecols=lambda col: col == 'Hackathon url'
+            )
             if 'Hackathon url' in df.columns:
                 urls = df['Hackathon url'].dropna().tolist()
                 self._ai_hackathons_cache = urls
@@ -73,10 +133,14 @@ class RandomSampler:
             return pd.DataFrame()
         
         try:
-            df = pd.read_excel(self.AI_HACKATHONS_FILE)
-            # Keep relevant columns for merging
+            # Keep relevant columns for merging; the rest are never parsed
             keep_cols = ['Hackathon url', 'Year', 'Organization Type', 'Organization Category', 
                         'In person vs virtual', 'Hackathon Tags']
+            df = pd.read_excel(
+                self.AI_HACKATHONS_FILE,
+                engine='calamine',
+                usecols=lambda col: col in keep_cols
+            )
             available_cols = [c for c in keep_cols if c in df.columns]
             return df[available_cols]
         except Exception as e:
@@ -153,11 +217,11 @@ class RandomSampler:
         """
         Get list of all available hackathons in the dataset with submission counts.
         """
-        if self.submissions_df is None or 'Submission Url' not in self.submissions_df.columns:
+        df = self.submissions_df
+        if df is None or 'Submission Url' not in df.columns:
             return []
         
-        # Extract hackathon slugs from submission URLs
-        df = self.submissions_df.copy()
+        # Extract hackathon slugs from submission URLs (the frame is a fresh read)
         df['hackathon_slug'] = df['Submission Url'].str.extract(r'https://([^.]+)\.devpost\.com')
         
         # Group by hackathon slug and count submissions
@@ -170,34 +234,37 @@ class RandomSampler:
         hackathon_counts.columns = ['slug', 'submission_count', 'challenge_title', 'organization']
         hackathon_counts = hackathon_counts.sort_values('submission_count', ascending=False)
         
-        result = []
-        for _, row in hackathon_counts.iterrows():
-            result.append({
-                'slug': row['slug'],
-                'challenge_title': row['challenge_title'],
-                'organization': row['organization'],
-                'submission_count': row['submission_count'],
-                'url': f"https://{row['slug']}.devpost.com"
-            })
+        hackathon_counts['url'] = 'https://' + hackathon_counts['slug'] + '.devpost.com'
         
-        return result
+        # Build the records column-wise rather than boxing a Series per row
+        return hackathon_counts[
+            ['slug', 'challenge_title', 'organization', 'submission_count', 'url']
+        ].to_dict('records')
     
-    def find_hackathon(self, identifier: str) -> Optional[Dict]:
+    def find_hackathon(
+        self,
+        identifier: str,
+        submissions: Optional[pd.DataFrame] = None,
+        slug_positions: Optional[Dict[str, np.ndarray]] = None
+    ) -> Optional[Dict]:
         """
         Find a hackathon by URL or name.
         Returns hackathon info if found, None otherwise.
+        
+        Args:
+            identifier: Hackathon URL or name
+            submissions: Optional result of _load_slugged_submissions to search
+                instead of reloading the dataset
+            slug_positions: Optional _index_slugs map of submissions
         """
-        if self.submissions_df is None:
+        df = submissions if submissions is not None else self._load_slugged_submissions()
+        if df is None:
             return None
         
         slug = self.extract_hackathon_slug(identifier)
         
-        # Extract slugs from submission URLs
-        df = self.submissions_df.copy()
-        df['hackathon_slug'] = df['Submission Url'].str.extract(r'https://([^.]+)\.devpost\.com')
-        
         # Filter by slug
-        matching = df[df['hackathon_slug'].str.lower() == slug]
+        matching = self._match_slug(df, slug, slug_positions)
         
         if matching.empty:
             # Try matching by Challenge Title (case-insensitive)
@@ -223,7 +290,10 @@ class RandomSampler:
         identifier: str, 
         sample_size: int = 30, 
         random_state: Optional[int] = None,
-        export_all: bool = False
+        export_all: bool = False,
+        submissions: Optional[pd.DataFrame] = None,
+        slug_positions: Optional[Dict[str, np.ndarray]] = None,
+        ai_metadata: Optional[pd.DataFrame] = None
     ) -> Tuple[pd.DataFrame, Dict]:
         """
         Get a random sample of submissions from a hackathon, or all submissions if export_all is True.
@@ -233,21 +303,23 @@ class RandomSampler:
             sample_size: Number of submissions to sample (default: 30, ignored if export_all=True)
             random_state: Random seed for reproducibility (optional)
             export_all: If True, return all submissions instead of a random sample
+            submissions: Optional result of _load_slugged_submissions to sample
+                from instead of reloading the dataset
+            slug_positions: Optional _index_slugs map of submissions
+            ai_metadata: Optional result of get_ai_hackathons_metadata to merge
+                from instead of rereading the AI hackathons workbook
         
         Returns:
             Tuple of (sampled DataFrame, hackathon info dict)
         """
-        if self.submissions_df is None:
+        df = submissions if submissions is not None else self._load_slugged_submissions()
+        if df is None:
             return pd.DataFrame(), {'error': 'No submission data available'}
         
         slug = self.extract_hackathon_slug(identifier)
         
-        # Extract slugs from submission URLs
-        df = self.submissions_df.copy()
-        df['hackathon_slug'] = df['Submission Url'].str.extract(r'https://([^.]+)\.devpost\.com')
-        
         # Filter by slug
-        matching = df[df['hackathon_slug'].str.lower() == slug]
+        matching = self._match_slug(df, slug, slug_positions)
         
         if matching.empty:
             # Try matching by Challenge Title (case-insensitive)
@@ -271,7 +343,8 @@ class RandomSampler:
             sampled = matching.copy()
         else:
             actual_sample_size = min(sample_size, total_submissions)
-            sampled = matching.sample(n=actual_sample_size, random_state=random_state)
+            positions = self._sample_positions(total_submissions, actual_sample_size, random_state)
+            sampled = matching.iloc[positions]
         
         # Calculate hackathon year from submission dates
         hackathon_year = None
@@ -309,7 +382,8 @@ class RandomSampler:
         # Try to merge AI hackathon metadata if available
         hackathon_url = hackathon_info.get('url')
         if hackathon_url:
-            ai_metadata = self.get_ai_hackathons_metadata()
+            if ai_metadata is None:
+                ai_metadata = self.get_ai_hackathons_metadata()
             if not ai_metadata.empty and 'Hackathon url' in ai_metadata.columns:
                 matching_meta = ai_metadata[ai_metadata['Hackathon url'] == hackathon_url]
                 if not matching_meta.empty:
@@ -327,7 +401,7 @@ class RandomSampler:
     def export_sample(
         self, 
         identifier: str, 
-        output_path: str, 
+        output_path: Union[str, BinaryIO], 
         sample_size: int = 30,
         random_state: Optional[int] = None
     ) -> bool:
@@ -336,7 +410,8 @@ class RandomSampler:
         
         Args:
             identifier: Hackathon URL or name
-            output_path: Path to save the Excel file
+            output_path: Path to save the Excel file, or a writable binary
+                buffer (e.g. io.BytesIO) to build the workbook in memory
             sample_size: Number of submissions to sample
             random_state: Random seed for reproducibility
         
@@ -349,26 +424,48 @@ class RandomSampler:
             return False
         
         try:
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                # Write sample data
-                sampled.to_excel(writer, sheet_name='Random Sample', index=False)
-                
-                # Write metadata
-                metadata = pd.DataFrame([{
-                    'Hackathon': info.get('challenge_title', ''),
-                    'Organization': info.get('organization', ''),
-                    'URL': info.get('url', ''),
-                    'Total Submissions': info.get('total_submissions', 0),
-                    'Sample Size': info.get('sample_size', 0),
-                    'Random Seed': random_state if random_state else 'Random'
-                }])
-                metadata.to_excel(writer, sheet_name='Metadata', index=False)
+            # Sample data first, then metadata; rows are streamed to the file
+            write_excel_sheets(output_path, self.sample_sheets(sampled, info, random_state))
             
             return True
         except Exception as e:
             print(f"Error exporting sample: {e}")
             return False
     
+    @staticmethod
+    def sample_sheets(
+        sampled: pd.DataFrame,
+        info: Dict,
+        random_state: Optional[int] = None
+    ) -> List[Tuple[str, pd.DataFrame]]:
+        """
+        Build the (sheet name, DataFrame) pairs of a single-sample workbook.
+        
+        Lets callers export a sample they already drew with get_random_sample
+        instead of drawing a new one.
+        
+        Args:
+            sampled: Sample DataFrame from get_random_sample
+            info: Hackathon info dict from get_random_sample
+            random_state: Random seed the sample was drawn with
+        
+        Returns:
+            List of (sheet name, DataFrame) pairs for write_excel_sheets
+        """
+        metadata = pd.DataFrame([{
+            'Hackathon': info.get('challenge_title', ''),
+            'Organization': info.get('organization', ''),
+            'URL': info.get('url', ''),
+            'Total Submissions': info.get('total_submissions', 0),
+            'Sample Size': info.get('sample_size', 0),
+            'Random Seed': random_state if random_state else 'Random'
+        }])
+        
+        return [
+            ('Random Sample', sampled),
+            ('Metadata', metadata)
+        ]
+    
     def search_hackathons(self, query: str, limit: int = 20) -> List[Dict]:
         """
         Search for hackathons by name or slug.
@@ -417,7 +514,7 @@ class RandomSampler:
     
     def load_hackathon_list(
         self, 
-        file_path: str,
+        file_path: Union[str, BinaryIO],
         filter_column: Optional[str] = None,
         filter_value: Optional[str] = None
     ) -> Tuple[pd.DataFrame, str]:
@@ -425,7 +522,7 @@ class RandomSampler:
         Load a hackathon list from an Excel file.
         
         Args:
-            file_path: Path to the Excel file containing hackathon URLs
+            file_path: Path to (or binary buffer of) the Excel file containing hackathon URLs
             filter_column: Optional column name to filter by (e.g., 'Include_in_Sample')
             filter_value: Optional value to filter for (e.g., 'YES')
         
@@ -433,17 +530,32 @@ class RandomSampler:
             Tuple of (DataFrame with hackathon list, URL column name)
         """
         try:
-            df = pd.read_excel(file_path)
+            # Uploaded files are passed as buffers that may already have been read
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+            header = pd.read_excel(file_path, engine='calamine', nrows=0).columns
+            
+            if filter_column and filter_value and filter_column not in header:
+                raise ValueError(f"Filter column '{filter_column}' not found in file")
+            
+            # Only parse the URL and filter columns when the URL column can be
+            # found by name; otherwise every column is needed for the search below
+            url_columns = [c for c in header if 'url' in str(c).lower()]
+            usecols = None
+            if url_columns:
+                usecols = [url_columns[0]]
+                if filter_column and filter_value:
+                    usecols.append(filter_column)
+            
+            if hasattr(file_path, 'seek'):
+                file_path.seek(0)
+            df = pd.read_excel(file_path, engine='calamine', usecols=usecols)
             
             # Apply filter if specified
             if filter_column and filter_value:
-                if filter_column in df.columns:
-                    df = df[df[filter_column] == filter_value]
-                else:
-                    raise ValueError(f"Filter column '{filter_column}' not found in file")
+                df = df[df[filter_column] == filter_value]
             
             # Find the URL column
-            url_columns = [c for c in df.columns if 'url' in c.lower()]
             if not url_columns:
                 # Try to find a column with devpost URLs
                 for col in df.columns:
@@ -459,6 +571,43 @@ class RandomSampler:
         except Exception as e:
             raise ValueError(f"Error loading hackathon list: {e}")
     
+    def _sample_hackathon(
+        self,
+        idx: int,
+        url: str,
+        sample_size: int,
+        random_state: Optional[int],
+        export_all: bool,
+        submissions: Optional[pd.DataFrame],
+        slug_positions: Optional[Dict[str, np.ndarray]],
+        ai_metadata: Optional[pd.DataFrame]
+    ) -> Dict:
+        """Sample a single hackathon for batch processing and build its result dict."""
+        sample_df, info = self.get_random_sample(
+            url, 
+            sample_size=sample_size,
+            random_state=random_state,
+            export_all=export_all,
+            submissions=submissions,
+            slug_positions=slug_positions,
+            ai_metadata=ai_metadata
+        )
+        
+        return {
+            'index': idx,
+            'url': url,
+            'slug': self.extract_hackathon_slug(url),
+            'hackathon_name': info.get('challenge_title', ''),
+            'organization': info.get('organization', ''),
+            'total_submissions': info.get('total_submissions', 0),
+            'sample_size': info.get('sample_size', 0),
+            'sample_df': sample_df,
+            'status': 'success' if not sample_df.empty else 'not_found',
+            'error': info.get('error', None),
+            'submission_bucket': info.get('submission_bucket', ''),
+            'hackathon_year': info.get('hackathon_year', None)
+        }
+    
     def batch_sample(
         self,
         hackathon_urls: List[str],
@@ -478,12 +627,18 @@ class RandomSampler:
             export_all: If True, return all submissions instead of a random sample
         
         Yields:
-            Dict with keys: url, slug, hackathon_name, organization, 
+            Dict with keys: index, url, slug, hackathon_name, organization, 
                            total_submissions, sample_size, sample_df, status, error,
                            submission_bucket, hackathon_year
         """
         total = len(hackathon_urls)
         
+        # Read, slug and index the dataset once for the whole batch, and read the
+        # AI hackathons workbook once rather than for every hackathon found
+        submissions = self._load_slugged_submissions()
+        slug_positions = self._index_slugs(submissions) if submissions is not None else None
+        ai_metadata = self.get_ai_hackathons_metadata()
+        
         for idx, url in enumerate(hackathon_urls):
             if not url or pd.isna(url):
                 continue
@@ -497,28 +652,11 @@ class RandomSampler:
             if random_state is not None:
                 current_random_state = random_state + idx
             
-            # Get sample
-            sample_df, info = self.get_random_sample(
-                url, 
-                sample_size=sample_size,
-                random_state=current_random_state,
-                export_all=export_all
+            result = self._sample_hackathon(
+                idx, url, sample_size, current_random_state, export_all,
+                submissions, slug_positions, ai_metadata
             )
             
-            result = {
-                'url': url,
-                'slug': self.extract_hackathon_slug(url),
-                'hackathon_name': info.get('challenge_title', ''),
-                'organization': info.get('organization', ''),
-                'total_submissions': info.get('total_submissions', 0),
-                'sample_size': info.get('sample_size', 0),
-                'sample_df': sample_df,
-                'status': 'success' if not sample_df.empty else 'not_found',
-                'error': info.get('error', None),
-                'submission_bucket': info.get('submission_bucket', ''),
-                'hackathon_year': info.get('hackathon_year', None)
-            }
-            
             if progress_callback:
                 status = 'success' if result['status'] == 'success' else 'not found'
                 progress_callback(idx + 1, total, url, status)
@@ -527,7 +665,7 @@ class RandomSampler:
     
     def batch_sample_from_file(
         self,
-        file_path: str,
+        file_path: Union[str, BinaryIO],
         sample_size: int = 30,
         random_state: Optional[int] = None,
         progress_callback: Optional[Callable[[int, int, str, str], None]] = None,
@@ -539,7 +677,7 @@ class RandomSampler:
         Process hackathons from an Excel file and yield results.
         
         Args:
-            file_path: Path to Excel file with hackathon URLs
+            file_path: Path to (or binary buffer of) Excel file with hackathon URLs
             sample_size: Number of submissions to sample per hackathon (ignored if export_all=True)
             random_state: Base random seed
             progress_callback: Optional callback(current, total, url, status)
@@ -624,8 +762,14 @@ class RandomSampler:
             # Combine all samples into one DataFrame
             all_samples = []
             summary_data = []
+            status_counts = Counter()
+            total_samples = 0
             
             for result in results:
+                # Tally statistics in the same pass
+                status_counts[result['status']] += 1
+                total_samples += result['sample_size']
+                
                 if result['status'] == 'success' and not result['sample_df'].empty:
                     sample_df = result['sample_df'].copy()
                     # Add hackathon identifier columns
@@ -644,26 +788,29 @@ class RandomSampler:
                     'Error': result['error'] or ''
                 })
             
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                # Write combined samples
-                if all_samples:
-                    combined_df = pd.concat(all_samples, ignore_index=True)
-                    combined_df.to_excel(writer, sheet_name='All Samples', index=False)
+            sheets = []
+            
+            # Combined samples first: the largest sheet is streamed row by row
+            if all_samples:
+                combined_df = pd.concat(all_samples, ignore_index=True)
+                sheets.append(('All Samples', combined_df))
+            
+            # Summary
+            if include_summary:
+                summary_df = pd.DataFrame(summary_data)
+                sheets.append(('Summary', summary_df))
                 
-                # Write summary
-                if include_summary:
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-                    # Write statistics
-                    stats = {
-                        'Total Hackathons Processed': len(results),
-                        'Hackathons Found': sum(1 for r in results if r['status'] == 'success'),
-                        'Hackathons Not Found': sum(1 for r in results if r['status'] == 'not_found'),
-                        'Total Samples Collected': sum(r['sample_size'] for r in results),
-                    }
-                    stats_df = pd.DataFrame([stats])
-                    stats_df.to_excel(writer, sheet_name='Statistics', index=False)
+                # Statistics
+                stats = {
+                    'Total Hackathons Processed': len(results),
+                    'Hackathons Found': status_counts['success'],
+                    'Hackathons Not Found': status_counts['not_found'],
+                    'Total Samples Collected': total_samples,
+                }
+                stats_df = pd.DataFrame([stats])
+                sheets.append(('Statistics', stats_df))
+            
+            write_excel_sheets(output_path, sheets)
             
             return True
         except Exception as e:
@@ -672,7 +819,7 @@ class RandomSampler:
     
     def get_batch_preview(
         self,
-        file_path: str,
+        file_path: Union[str, BinaryIO],
         limit: int = 10,
         filter_column: Optional[str] = None,
         filter_value: Optional[str] = None
@@ -681,7 +828,7 @@ class RandomSampler:
         Preview hackathons from a list file and check which ones have data.
         
         Args:
-            file_path: Path to Excel file with hackathon URLs
+            file_path: Path to (or binary buffer of) Excel file with hackathon URLs
             limit: Number of hackathons to preview
             filter_column: Optional column name to filter by (e.g., 'Include_in_Sample')
             filter_value: Optional value to filter for (e.g., 'YES')
@@ -697,6 +844,9 @@ class RandomSampler:
         urls = df[url_column].dropna().tolist()
         total = len(urls)
         
+        submissions = self._load_slugged_submissions()
+        slug_positions = self._index_slugs(submissions) if submissions is not None else None
+        
         preview = []
         for url in urls[:limit]:
             url = str(url).strip()
@@ -704,7 +854,7 @@ class RandomSampler:
                 continue
             
             slug = self.extract_hackathon_slug(url)
-            hackathon_info = self.find_hackathon(url)
+            hackathon_info = self.find_hackathon(url, submissions, slug_positions)
             
             preview.append({
                 'url': url,
@@ -1,7 +1,9 @@
+import datetime
 import json
 import hashlib
 import re
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 import os
 
 
@@ -45,12 +47,18 @@ def tokenize_field(value: str, delimiter: str = ',') -> List[str]:
     return cleaned_tokens
 
 
-def compute_file_hash(file_path: str) -> str:
+def compute_file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
     sha256_hash = hashlib.sha256()
     
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+    # Read into one reused buffer instead of allocating a bytes object per block
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
     
     return sha256_hash.hexdigest()
 
@@ -83,6 +91,72 @@ def clean_string(value: str) -> str:
     return value
 
 
+def clean_string_series(values: 'pd.Series') -> 'pd.Series':
+    # Column-wide clean_string: the strip and whitespace collapse run once over
+    # the present values instead of as a Python call per cell
+    present = values.notna().to_numpy(copy=True)
+    present[present] = values[present].astype(bool).to_numpy()
+    
+    result = pd.Series([""] * len(values), index=values.index, name=values.name)
+    result[present] = (
+        values[present].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True).to_numpy()
+    )
+    return result
+
+
+def _excel_cell(value: Any) -> Any:
+    # numpy scalars in object columns are unboxed so numbers stay numbers;
+    # datetime64/timedelta64 go through pandas, since .item() on a nanosecond
+    # value returns a bare int
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.timedelta64):
+        value = pd.Timedelta(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    
+    if isinstance(value, float) and value != value:
+        return None
+    
+    if not isinstance(value, (str, int, float, datetime.date, datetime.time, datetime.timedelta)):
+        return str(value)
+    
+    return value
+
+
+def write_excel_sheets(
+    output: Union[str, BinaryIO],
+    sheets: List[Tuple[str, 'pd.DataFrame']]
+) -> None:
+    # xlsxwriter's constant_memory mode flushes each row to the file as soon as
+    # the next one starts, keeping memory flat for large exports. It requires
+    # row-by-row writes, which pandas' ExcelWriter (column-major) doesn't do,
+    # so the rows are written here directly.
+    import xlsxwriter
+    
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+        'nan_inf_to_errors': True,
+        'remove_timezone': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+    })
+    header_format = workbook.add_format({'bold': True})
+    
+    for sheet_name, df in sheets:
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+        
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_idx, 0, [_excel_cell(value) for value in row])
+    
+    workbook.close()
+
+
 def parse_datetime(value: str) -> Optional[str]:
     if not value or pd.isna(value):
         return None
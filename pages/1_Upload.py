@@ -1,6 +1,6 @@
 import streamlit as st
 import os
-import tempfile
+import time
 
 st.set_page_config(
     page_title="Upload Files - Hackathon Analysis",
@@ -20,6 +20,27 @@ def get_ingestor(_db):
     from app.ingest import DataIngestor
     return DataIngestor(_db)
 
+# Minimum seconds between progress bar redraws while files are processed
+PROGRESS_INTERVAL = 0.1
+
+def progress_updater(progress_bar, status_text, action):
+    """Build an ingest progress callback that redraws at most every PROGRESS_INTERVAL seconds.
+    
+    Already-ingested files are skipped almost instantly, so redrawing for each
+    one would spend most of the run on browser round trips.
+    """
+    last_update = 0.0
+    
+    def update(current, total, filename):
+        nonlocal last_update
+        now = time.monotonic()
+        if now - last_update >= PROGRESS_INTERVAL or current == total:
+            progress_bar.progress(current / total if total > 0 else 0)
+            status_text.text(f"{action} file {current}/{total}: {filename}")
+            last_update = now
+    
+    return update
+
 def inject_css():
     """Lazily inject global CSS."""
     from app.ui import inject_global_css
@@ -66,9 +87,9 @@ if upload_method == "ZIP File Upload":
             st.error("❌ File size exceeds 1GB limit. Please upload a smaller file.")
         else:
             if st.button("🚀 Start Processing", type="primary"):
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_file_path = tmp_file.name
+                # The upload is already an in-memory file; ZipFile reads it
+                # directly instead of from a copy written to disk first
+                uploaded_file.seek(0)
                 
                 try:
                     st.markdown("### Processing Status")
@@ -76,13 +97,10 @@ if upload_method == "ZIP File Upload":
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    def update_progress(current, total, filename):
-                        progress = current / total if total > 0 else 0
-                        progress_bar.progress(progress)
-                        status_text.text(f"Processing file {current}/{total}: {filename}")
+                    update_progress = progress_updater(progress_bar, status_text, "Processing")
                     
                     with st.spinner("Extracting and processing files..."):
-                        results = ingestor.process_zip_file(tmp_file_path, update_progress)
+                        results = ingestor.process_zip_file(uploaded_file, update_progress)
                     
                     progress_bar.progress(1.0)
                     status_text.text("Processing complete!")
@@ -116,10 +134,7 @@ if upload_method == "ZIP File Upload":
                             retry_progress_bar = st.progress(0)
                             retry_status_text = st.empty()
                             
-                            def update_retry_progress(current, total, filename):
-                                progress = current / total if total > 0 else 0
-                                retry_progress_bar.progress(progress)
-                                retry_status_text.text(f"Retrying file {current}/{total}: {filename}")
+                            update_retry_progress = progress_updater(retry_progress_bar, retry_status_text, "Retrying")
                             
                             with st.spinner("Retrying failed files..."):
                                 retry_results = ingestor.retry_files_from_errors(results['errors'], update_retry_progress)
@@ -154,10 +169,6 @@ if upload_method == "ZIP File Upload":
                 
                 except Exception as e:
                     st.error(f"❌ Error processing ZIP file: {str(e)}")
-                
-                finally:
-                    if os.path.exists(tmp_file_path):
-                        os.unlink(tmp_file_path)
 
 else:
     st.subheader("📁 Local Folder Processing")
@@ -202,10 +213,7 @@ else:
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                def update_progress(current, total, filename):
-                    progress = current / total if total > 0 else 0
-                    progress_bar.progress(progress)
-                    status_text.text(f"Processing file {current}/{total}: {filename}")
+                update_progress = progress_updater(progress_bar, status_text, "Processing")
                 
                 with st.spinner("Processing files..."):
                     results = ingestor.process_folder(
@@ -246,10 +254,7 @@ else:
                         retry_progress_bar = st.progress(0)
                         retry_status_text = st.empty()
                         
-                        def update_retry_progress(current, total, filename):
-                            progress = current / total if total > 0 else 0
-                            retry_progress_bar.progress(progress)
-                            retry_status_text.text(f"Retrying file {current}/{total}: {filename}")
+                        update_retry_progress = progress_updater(retry_progress_bar, retry_status_text, "Retrying")
                         
                         with st.spinner("Retrying failed files..."):
                             retry_results = ingestor.retry_files_from_errors(results['errors'], update_retry_progress)
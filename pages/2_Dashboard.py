@@ -1,5 +1,9 @@
 import streamlit as st
 
+# Enough cache entries for every method/chart (and a few slider settings) of
+# the current data fingerprint; older fingerprints fall out instead of piling up
+FINGERPRINT_CACHE_ENTRIES = 32
+
 st.set_page_config(
     page_title="Dashboard - Hackathon Analysis",
     page_icon="📊",
@@ -18,6 +22,24 @@ def get_chart_generator():
     from app.visualize import ChartGenerator
     return ChartGenerator()
 
+@st.cache_data(show_spinner=False, max_entries=FINGERPRINT_CACHE_ENTRIES)
+def load_aggregate(_aggregator, fingerprint, method, **kwargs):
+    """Run an aggregator method once per data fingerprint instead of on every rerun."""
+    return getattr(_aggregator, method)(**kwargs)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_fingerprint(_aggregator):
+    """Stat the data files at most every few seconds rather than on every widget change."""
+    return _aggregator.data_fingerprint()
+
+@st.cache_data(show_spinner=False, max_entries=FINGERPRINT_CACHE_ENTRIES)
+def load_chart(_aggregator, _chart_gen, fingerprint, method, method_kwargs, chart, head=None, **chart_kwargs):
+    """Build a Plotly figure once per data fingerprint and chart parameters."""
+    df = load_aggregate(_aggregator, fingerprint, method, **method_kwargs)
+    if head is not None:
+        df = df.head(head)
+    return getattr(_chart_gen, chart)(df, **chart_kwargs)
+
 def inject_css():
     """Lazily inject global CSS."""
     from app.ui import inject_global_css
@@ -36,7 +58,9 @@ if not aggregator.data_exists():
     st.info("👉 Navigate to the **Upload** page to get started!")
     st.stop()
 
-summary = aggregator.get_summary_statistics()
+fingerprint = load_fingerprint(aggregator)
+
+summary = load_aggregate(aggregator, fingerprint, 'get_summary_statistics')
 
 st.subheader("📈 Summary Statistics")
 
@@ -107,11 +131,13 @@ with tab1:
     
     top_n_tech = st.slider("Number of technologies to display:", 10, 50, 20, key="tech_slider")
     
-    tech_df_chart = aggregator.get_top_technologies(limit=top_n_tech)
+    tech_df_chart = load_aggregate(aggregator, fingerprint, 'get_top_technologies', limit=top_n_tech)
     
     if not tech_df_chart.empty:
-        fig_tech = chart_gen.create_bar_chart(
-            tech_df_chart,
+        fig_tech = load_chart(
+            aggregator, chart_gen, fingerprint,
+            'get_top_technologies', {'limit': top_n_tech},
+            'create_bar_chart',
             x='Technology',
             y='Count',
             title=f'Top {top_n_tech} Technologies',
@@ -120,7 +146,7 @@ with tab1:
         st.plotly_chart(fig_tech, width='stretch')
         
         with st.expander("📋 View Data Table (Full Dataset)"):
-            tech_df_full = aggregator.get_top_technologies(limit=None)
+            tech_df_full = load_aggregate(aggregator, fingerprint, 'get_top_technologies', limit=None)
             st.dataframe(tech_df_full, width='stretch')
     else:
         st.info("No technology data available")
@@ -131,11 +157,13 @@ with tab1:
     
     top_n_skills = st.slider("Number of skills to display:", 10, 50, 20, key="skills_slider")
     
-    skills_df_chart = aggregator.get_top_skills(limit=top_n_skills)
+    skills_df_chart = load_aggregate(aggregator, fingerprint, 'get_top_skills', limit=top_n_skills)
     
     if not skills_df_chart.empty:
-        fig_skills = chart_gen.create_bar_chart(
-            skills_df_chart,
+        fig_skills = load_chart(
+            aggregator, chart_gen, fingerprint,
+            'get_top_skills', {'limit': top_n_skills},
+            'create_bar_chart',
             x='Skill',
             y='Count',
             title=f'Top {top_n_skills} Skills',
@@ -144,7 +172,7 @@ with tab1:
         st.plotly_chart(fig_skills, width='stretch')
         
         with st.expander("📋 View Data Table (Full Dataset)"):
-            skills_df_full = aggregator.get_top_skills(limit=None)
+            skills_df_full = load_aggregate(aggregator, fingerprint, 'get_top_skills', limit=None)
             st.dataframe(skills_df_full, width='stretch')
     else:
         st.info("No skills data available")
@@ -152,13 +180,16 @@ with tab1:
 with tab2:
     st.markdown("### 🏆 Submissions by Hackathon")
     
-    hackathon_df = aggregator.get_submissions_by_hackathon()
+    hackathon_df = load_aggregate(aggregator, fingerprint, 'get_submissions_by_hackathon')
     
     if not hackathon_df.empty:
         top_n_hackathons = st.slider("Number of hackathons to display:", 10, 50, 20, key="hackathon_slider")
         
-        fig_hackathons = chart_gen.create_bar_chart(
-            hackathon_df.head(top_n_hackathons),
+        fig_hackathons = load_chart(
+            aggregator, chart_gen, fingerprint,
+            'get_submissions_by_hackathon', {},
+            'create_bar_chart',
+            head=top_n_hackathons,
             x='Hackathon',
             y='Submissions',
             title=f'Top {top_n_hackathons} Hackathons by Submissions',
@@ -175,14 +206,16 @@ with tab2:
     
     st.markdown("### 👥 Team Size Distribution")
     
-    team_size_df = aggregator.get_team_size_distribution()
+    team_size_df = load_aggregate(aggregator, fingerprint, 'get_team_size_distribution')
     
     if not team_size_df.empty:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig_team_pie = chart_gen.create_pie_chart(
-                team_size_df,
+            fig_team_pie = load_chart(
+                aggregator, chart_gen, fingerprint,
+                'get_team_size_distribution', {},
+                'create_pie_chart',
                 values='Count',
                 names='Team Size',
                 title='Team Size Distribution'
@@ -200,11 +233,13 @@ with tab3:
     
     top_n_countries = st.slider("Number of countries to display:", 10, 50, 20, key="country_slider")
     
-    country_df_chart = aggregator.get_country_distribution(limit=top_n_countries)
+    country_df_chart = load_aggregate(aggregator, fingerprint, 'get_country_distribution', limit=top_n_countries)
     
     if not country_df_chart.empty:
-        fig_countries = chart_gen.create_bar_chart(
-            country_df_chart,
+        fig_countries = load_chart(
+            aggregator, chart_gen, fingerprint,
+            'get_country_distribution', {'limit': top_n_countries},
+            'create_bar_chart',
             x='Country',
             y='Count',
             title=f'Top {top_n_countries} Countries',
@@ -213,7 +248,7 @@ with tab3:
         st.plotly_chart(fig_countries, width='stretch')
         
         with st.expander("📋 View Data Table (Full Dataset)"):
-            country_df_full = aggregator.get_country_distribution(limit=None)
+            country_df_full = load_aggregate(aggregator, fingerprint, 'get_country_distribution', limit=None)
             st.dataframe(country_df_full, width='stretch')
     else:
         st.info("No country data available")
@@ -224,11 +259,13 @@ with tab3:
     
     top_n_occupations = st.slider("Number of occupations to display:", 10, 50, 15, key="occupation_slider")
     
-    occupation_df_chart = aggregator.get_occupation_breakdown(limit=top_n_occupations)
+    occupation_df_chart = load_aggregate(aggregator, fingerprint, 'get_occupation_breakdown', limit=top_n_occupations)
     
     if not occupation_df_chart.empty:
-        fig_occupations = chart_gen.create_bar_chart(
-            occupation_df_chart,
+        fig_occupations = load_chart(
+            aggregator, chart_gen, fingerprint,
+            'get_occupation_breakdown', {'limit': top_n_occupations},
+            'create_bar_chart',
             x='Occupation',
             y='Count',
             title=f'Top {top_n_occupations} Occupations',
@@ -237,7 +274,7 @@ with tab3:
         st.plotly_chart(fig_occupations, width='stretch')
         
         with st.expander("📋 View Data Table (Full Dataset)"):
-            occupation_df_full = aggregator.get_occupation_breakdown(limit=None)
+            occupation_df_full = load_aggregate(aggregator, fingerprint, 'get_occupation_breakdown', limit=None)
             st.dataframe(occupation_df_full, width='stretch')
     else:
         st.info("No occupation data available")
@@ -246,14 +283,16 @@ with tab3:
     
     st.markdown("### 🎓 Student vs Professional")
     
-    specialty_df = aggregator.get_specialty_distribution()
+    specialty_df = load_aggregate(aggregator, fingerprint, 'get_specialty_distribution')
     
     if not specialty_df.empty:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig_specialty = chart_gen.create_pie_chart(
-                specialty_df,
+            fig_specialty = load_chart(
+                aggregator, chart_gen, fingerprint,
+                'get_specialty_distribution', {},
+                'create_pie_chart',
                 values='Count',
                 names='Specialty',
                 title='Student vs Professional Distribution'
@@ -270,14 +309,16 @@ with tab3:
     
     st.markdown("### 💼 Work Experience Distribution")
     
-    work_exp_df = aggregator.get_work_experience_distribution()
+    work_exp_df = load_aggregate(aggregator, fingerprint, 'get_work_experience_distribution')
     
     if not work_exp_df.empty:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            fig_work_exp = chart_gen.create_pie_chart(
-                work_exp_df,
+            fig_work_exp = load_chart(
+                aggregator, chart_gen, fingerprint,
+                'get_work_experience_distribution', {},
+                'create_pie_chart',
                 values='Count',
                 names='Experience Range',
                 title='Work Experience Distribution'
@@ -299,11 +340,13 @@ with tab4:
         index=1
     )
     
-    time_trends_df = aggregator.get_time_trends(period=period)
+    time_trends_df = load_aggregate(aggregator, fingerprint, 'get_time_trends', period=period)
     
     if not time_trends_df.empty:
-        fig_time = chart_gen.create_line_chart(
-            time_trends_df,
+        fig_time = load_chart(
+            aggregator, chart_gen, fingerprint,
+            'get_time_trends', {'period': period},
+            'create_line_chart',
             x='Date',
             y='Submissions',
             title=f'Submissions Over Time ({period.capitalize()})',
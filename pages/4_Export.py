@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import pandas as pd
+from functools import partial
 from datetime import datetime
 
 st.set_page_config(
@@ -21,6 +22,11 @@ def get_exporter(_aggregator):
     from app.export import ExcelExporter
     return ExcelExporter(_aggregator)
 
+def read_file_bytes(file_path):
+    """Read a file for download; passed to st.download_button as a deferred data source."""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
 def inject_css():
     """Lazily inject global CSS."""
     from app.ui import inject_global_css
@@ -356,12 +362,11 @@ if not export_history.empty:
                 file_path = os.path.join(exporter.output_dir, row['Filename'])
                 
                 if os.path.exists(file_path):
-                    with open(file_path, 'rb') as f:
-                        file_data = f.read()
-                    
+                    # Defer the read until the button is clicked so listing the
+                    # history doesn't load every past export on each rerun
                     st.download_button(
                         label="⬇️ Download",
-                        data=file_data,
+                        data=partial(read_file_bytes, file_path),
                         file_name=row['Filename'],
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         key=f"download_{idx}"
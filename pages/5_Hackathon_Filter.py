@@ -26,6 +26,29 @@ def get_filter_tool(_aggregator, _source):
     from app.hackathon_filter import HackathonFilter
     return HackathonFilter(_aggregator, _source)
 
+@st.cache_data(show_spinner=False)
+def load_hackathon_overview(_source):
+    """Build the All Hackathons table once, Arrow-backed so reruns don't re-encode it."""
+    all_hackathons = _source.get_all_hackathons()
+    
+    display_df = all_hackathons[[
+        'Organization name',
+        'Hackathon name',
+        'Total participant count',
+        'Total valid submissions (excluding spam)',
+        'In person vs virtual'
+    ]]
+    
+    display_df.columns = [
+        'Organization',
+        'Hackathon',
+        'Participants',
+        'Valid Submissions',
+        'Event Type'
+    ]
+    
+    return display_df.convert_dtypes(dtype_backend='pyarrow')
+
 def inject_css():
     """Lazily inject global CSS."""
     from app.ui import inject_global_css
@@ -148,15 +171,21 @@ with tab1:
                         if filter_tool.export_hackathon_data(selected_hackathon, output_path):
                             st.success(f"✅ Exported to: {output_path}")
                             
+                            # Read the file once; reruns serve the bytes from session state
                             with open(output_path, 'rb') as f:
-                                st.download_button(
-                                    label="⬇️ Download File",
-                                    data=f.read(),
-                                    file_name=export_filename,
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                )
+                                st.session_state['hackathon_export'] = (selected_hackathon, export_filename, f.read())
                         else:
+                            st.session_state.pop('hackathon_export', None)
                             st.error("❌ Failed to export data")
+                    
+                    hackathon_export = st.session_state.get('hackathon_export')
+                    if hackathon_export and hackathon_export[0] == selected_hackathon:
+                        st.download_button(
+                            label="⬇️ Download File",
+                            data=hackathon_export[2],
+                            file_name=hackathon_export[1],
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        )
 
 with tab2:
     st.markdown("### 🏢 Filter Data by Organizer")
@@ -259,16 +288,22 @@ with tab2:
                         if filter_tool.export_organizer_data(selected_organizer, output_path):
                             st.success(f"✅ Exported to: {output_path}")
                             
+                            # Read the file once; reruns serve the bytes from session state
                             with open(output_path, 'rb') as f:
-                                st.download_button(
-                                    label="⬇️ Download File",
-                                    data=f.read(),
-                                    file_name=export_filename,
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    key="download_organizer"
-                                )
+                                st.session_state['organizer_export'] = (selected_organizer, export_filename, f.read())
                         else:
+                            st.session_state.pop('organizer_export', None)
                             st.error("❌ Failed to export data")
+                    
+                    organizer_export = st.session_state.get('organizer_export')
+                    if organizer_export and organizer_export[0] == selected_organizer:
+                        st.download_button(
+                            label="⬇️ Download File",
+                            data=organizer_export[2],
+                            file_name=organizer_export[1],
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            key="download_organizer"
+                        )
 
 with tab3:
     st.markdown("### 📊 Source Data Overview")
@@ -314,21 +349,7 @@ with tab3:
         st.markdown("#### 📋 All Hackathons")
         st.markdown(f"Showing all {len(all_hackathons)} hackathons from the source data:")
         
-        display_df = all_hackathons[[
-            'Organization name',
-            'Hackathon name',
-            'Total participant count',
-            'Total valid submissions (excluding spam)',
-            'In person vs virtual'
-        ]].copy()
-        
-        display_df.columns = [
-            'Organization',
-            'Hackathon',
-            'Participants',
-            'Valid Submissions',
-            'Event Type'
-        ]
+        display_df = load_hackathon_overview(source)
         
         st.dataframe(display_df, width='stretch', hide_index=True)
     else:
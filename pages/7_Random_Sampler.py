@@ -1,9 +1,36 @@
 import streamlit as st
 import os
 import io
+import re
+import hashlib
+import pickle
+import html
+import shutil
+import tempfile
+import zipfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import numpy as np
 import pandas as pd
+import requests
+from rapidfuzz import fuzz, process
 from datetime import datetime
 
+from app.utils import write_excel_sheets
+
+# Minimum seconds between progress bar redraws during batch runs
+PROGRESS_INTERVAL = 0.1
+
+# Rows of the batch results table shown per "Show more" step
+RESULTS_PAGE_ROWS = 100
+
+# Batch samples are spilled to per-run directories under this app-owned root;
+# ones untouched for SPILL_TTL seconds belong to ended sessions and are swept
+SPILL_ROOT = os.path.join(os.getenv('TEMP_DIR', './temp'), 'sampler_spill')
+SPILL_TTL = 6 * 60 * 60
+
 st.set_page_config(
     page_title="Random Sampler - Hackathon Analysis",
     page_icon="🎲",
@@ -22,6 +49,498 @@ def get_sampler(_aggregator):
     from app.random_sampler import RandomSampler
     return RandomSampler(_aggregator)
 
+@st.cache_data(ttl=60, show_spinner=False)
+def load_data_exists(_aggregator):
+    """Check for processed data at most once a minute instead of on every keystroke."""
+    return _aggregator.data_exists()
+
+@st.cache_data(show_spinner=False)
+def load_ai_hackathons_count(_sampler):
+    """Count the built-in AI hackathons list once; the file ships with the app."""
+    return _sampler.get_ai_hackathons_count()
+
+HACKATHON_COLUMNS = ['Hackathon', 'Organization', 'Submissions', 'URL']
+
+def _hackathon_table(hackathons):
+    """Shape hackathon info dicts into the browser's display columns.
+    
+    Lowercased slug and title columns are kept alongside for searching.
+    """
+    hackathon_df = pd.DataFrame(
+        hackathons,
+        columns=['challenge_title', 'organization', 'submission_count', 'url', 'slug']
+    )
+    hackathon_df.columns = HACKATHON_COLUMNS + ['_slug_lower']
+    hackathon_df['_slug_lower'] = hackathon_df['_slug_lower'].fillna('').str.lower()
+    hackathon_df['_title_lower'] = hackathon_df['Hackathon'].fillna('').str.lower()
+    return hackathon_df.convert_dtypes(dtype_backend='pyarrow')
+
+@st.cache_data(ttl=5, show_spinner=False)
+def load_fingerprint(_aggregator):
+    """Stat the data files at most every few seconds rather than on every widget change."""
+    return _aggregator.data_fingerprint()
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_hackathons_df(_sampler, fingerprint):
+    """Build the full hackathon browser table once per dataset version instead of on every keystroke."""
+    return _hackathon_table(_sampler.get_available_hackathons())
+
+def search_hackathons_df(hackathon_df, query, limit=50):
+    """Rank the cached browser table against a query, mirroring RandomSampler.search_hackathons.
+    
+    Exact slug > slug prefix > slug substring > title substring, then by submission
+    count; done with vectorized string kernels instead of rescanning the dataset.
+    """
+    query_lower = query.lower()
+    slugs = hackathon_df['_slug_lower']
+    score = np.select(
+        [
+            (slugs == query_lower).to_numpy(bool),
+            slugs.str.startswith(query_lower).to_numpy(bool),
+            slugs.str.contains(query_lower, regex=False).to_numpy(bool),
+            hackathon_df['_title_lower'].str.contains(query_lower, regex=False).to_numpy(bool),
+        ],
+        [100, 80, 60, 40],
+        default=0
+    )
+    matches = hackathon_df.assign(_score=score)[score > 0]
+    matches = matches.sort_values(['_score', 'Submissions'], ascending=False, kind='stable')
+    return matches.head(limit)
+
+def suggest_hackathons(hackathon_df, query, limit=10):
+    """Fuzzy-match a missed hackathon name or URL against the cached browser table.
+    
+    rapidfuzz's C++ scorers run over the whole corpus in milliseconds, and
+    catch typos that a substring search would miss.
+    """
+    choices = hackathon_df['_slug_lower'] + ' ' + hackathon_df['_title_lower']
+    matches = process.extract(
+        query.lower(), choices, scorer=fuzz.WRatio, limit=limit, score_cutoff=60
+    )
+    return hackathon_df.loc[[key for _, _, key in matches]]
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_batch_preview(_sampler, data_bytes, fingerprint):
+    """Parse an uploaded hackathon list once per file content and dataset version.
+    
+    The found/not-found counts depend on the submissions, so the data
+    fingerprint is part of the key alongside the file bytes.
+    
+    Returns:
+        Tuple of (has_include_column, total rows in file or None without that
+        column, preview dicts, hackathons to process)
+    """
+    buffer = io.BytesIO(data_bytes)
+    
+    # Sniff the header only, then parse just the one column that is counted
+    header = pd.read_excel(buffer, engine='calamine', nrows=0).columns
+    has_include_column = 'Include_in_Sample' in header
+    total_in_file = None
+    if has_include_column:
+        buffer.seek(0)
+        total_in_file = len(pd.read_excel(buffer, engine='calamine', usecols=['Include_in_Sample']))
+    
+    preview, total_count = _sampler.get_batch_preview(
+        buffer,
+        limit=10,
+        filter_column='Include_in_Sample' if has_include_column else None,
+        filter_value='YES' if has_include_column else None
+    )
+    return has_include_column, total_in_file, preview, total_count
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def build_sample_workbook(sample_token, _sampler, _sampled_df, _info, random_seed):
+    """Render the sample shown on screen to a workbook in memory, once per Generate.
+    
+    Keyed on the token stored at Generate time, so an unseeded run never gets
+    an earlier run's workbook and the dataset is not sampled a second time.
+    """
+    buffer = io.BytesIO()
+    write_excel_sheets(buffer, _sampler.sample_sheets(_sampled_df, _info, random_seed))
+    return buffer.getvalue()
+
+def batch_results_token(results):
+    """Digest identifying one batch run, used as the cache key for its export."""
+    payload = [(r['url'], r['status'], r['sample_size']) for r in results]
+    # Re-running the same list with another seed must not reuse the old workbook
+    payload.append(datetime.now().isoformat())
+    return hashlib.blake2b(pickle.dumps(payload), digest_size=16).hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=60 * 60)
+def build_batch_workbook(results_token, _build_sheets):
+    """Assemble and render a batch export once per run rather than on every rerun.
+    
+    Every run has a new token, so the cache is bounded to the last few runs and
+    an hour; older workbooks would otherwise stay in memory until restart.
+    """
+    output_buffer = io.BytesIO()
+    write_excel_sheets(output_buffer, _build_sheets())
+    return output_buffer.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=60 * 60)
+def build_batch_parquet(results_token, _build_sheets):
+    """Serialize just the combined samples sheet to zstd Parquet, once per run.
+    
+    Bounded like build_batch_workbook, since every run has a new token.
+    
+    The sheet is mostly repeated free text, which zstd packs tighter than
+    Snappy for a download, at a similar write speed.
+    """
+    _, combined_samples = _build_sheets()[0]
+    output_buffer = io.BytesIO()
+    combined_samples.to_parquet(output_buffer, engine='pyarrow', compression='zstd', index=False)
+    return output_buffer.getvalue()
+
+@st.fragment
+def render_sample_export(sampler, sampled_df, info, random_seed, sample_token, timestamp):
+    """Render the single-sample export controls.
+    
+    As a fragment, editing the filename or clicking Save only reruns this block,
+    not the whole page with its tabs and hackathon browser.
+    """
+    st.markdown("---")
+    st.markdown("### 💾 Export Sample")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        default_filename = f"{info.get('slug', 'hackathon')}_random_sample_{timestamp}.xlsx"
+        export_filename = st.text_input(
+            "Export Filename:",
+            value=default_filename,
+            help="Filename for the exported Excel file"
+        )
+    
+    # The workbook is built from the sample on screen, only when one of the
+    # buttons is clicked, and cached for that Generate
+    build_workbook = partial(build_sample_workbook, sample_token, sampler, sampled_df, info, random_seed)
+    
+    with col2:
+        st.markdown("&nbsp;")
+        st.markdown("&nbsp;")
+        st.download_button(
+            label="⬇️ Download File",
+            data=build_workbook,
+            file_name=export_filename,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key="export_sample"
+        )
+        
+        if st.button("💾 Save Copy to Exports Folder", key="save_sample"):
+            export_dir = os.getenv('EXPORT_DIR', './data/processed')
+            os.makedirs(export_dir, exist_ok=True)
+            output_path = os.path.join(export_dir, export_filename)
+            
+            with open(output_path, 'wb') as f:
+                f.write(build_workbook())
+            st.success(f"✅ Exported to: {output_path}")
+
+def spill_sample(result, spill_dir):
+    """Move a batch result's sample to a Parquet file so session state only holds metadata.
+    
+    Keeping every sample DataFrame alive for the whole session made memory grow
+    with the batch; the export reads them back from disk when it is built.
+    """
+    sample_df = result.pop('sample_df', None)
+    result['sample_path'] = None
+    if result['status'] == 'success' and sample_df is not None:
+        result['sample_path'] = os.path.join(spill_dir, f"{result['index']}.parquet")
+        sample_df.to_parquet(result['sample_path'], engine='pyarrow', index=False)
+
+def discard_spilled_samples(key_prefix):
+    """Delete the spill directory of a previous batch or AI export, if any."""
+    spill_dir = st.session_state.pop(f"{key_prefix}_spill_dir", None)
+    if spill_dir:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+def sweep_spill_dirs(max_age=SPILL_TTL):
+    """Delete spill directories left behind by sessions that ended without clearing them."""
+    if not os.path.isdir(SPILL_ROOT):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(SPILL_ROOT):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def new_spill_dir(key_prefix):
+    """Replace the session's spill directory for a new run, sweeping stale ones first."""
+    discard_spilled_samples(key_prefix)
+    sweep_spill_dirs()
+    os.makedirs(SPILL_ROOT, exist_ok=True)
+    spill_dir = tempfile.mkdtemp(prefix=f"{key_prefix}_samples_", dir=SPILL_ROOT)
+    st.session_state[f"{key_prefix}_spill_dir"] = spill_dir
+    return spill_dir
+
+def touch_spill_dir(key_prefix):
+    """Mark the session's spill directory as in use so the sweep leaves it alone."""
+    spill_dir = st.session_state.get(f"{key_prefix}_spill_dir")
+    if spill_dir and os.path.isdir(spill_dir):
+        os.utime(spill_dir)
+
+@st.fragment
+def render_batch_results(results, results_token, timestamp, key_prefix, state_keys, ai_export=False):
+    """Render metrics, the detail table and downloads for a finished batch or AI export.
+    
+    A fragment, so Show more and Prepare only rerun the results section.
+    
+    Args:
+        results: Result dicts from RandomSampler.batch_sample, with samples moved out by spill_sample
+        results_token: Run token from batch_results_token, used as the export cache key
+        timestamp: Batch completion time (YYYYmmdd_HHMMSS) used in the download filenames
+        key_prefix: Widget key prefix ('batch' or 'ai')
+        state_keys: Session state keys removed by the Clear Results button
+        ai_export: Use the AI export labels, bucket/year columns and sheet name
+    """
+    st.markdown("---")
+    st.markdown("### 📊 Processing Results")
+    
+    # Results still being viewed keep their samples out of the stale sweep
+    touch_spill_dir(key_prefix)
+    
+    # Tally everything in one pass over the results
+    success_count = not_found_count = total_samples = 0
+    for r in results:
+        success_count += r['status'] == 'success'
+        not_found_count += r['status'] == 'not_found'
+        total_samples += r['sample_size']
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total AI Hackathons" if ai_export else "Total Hackathons", len(results))
+    
+    with col2:
+        st.metric("Found in Dataset", success_count)
+    
+    with col3:
+        st.metric("Not Found", not_found_count)
+    
+    with col4:
+        st.metric("Total Submissions" if ai_export else "Total Samples", total_samples)
+    
+    # Show detailed results
+    st.markdown("#### 📋 Detailed Results")
+    
+    # Built column by column; no per-row dicts to transpose
+    columns = {
+        'URL': [r['url'] for r in results],
+        'Hackathon': [r['hackathon_name'] or 'N/A' for r in results],
+        'Organization': [r['organization'] or 'N/A' for r in results],
+        'Total Submissions': [r['total_submissions'] for r in results],
+        'Exported' if ai_export else 'Sampled': [r['sample_size'] for r in results]
+    }
+    if ai_export:
+        columns['Bucket'] = [r.get('submission_bucket', 'N/A') for r in results]
+    columns['Status'] = np.where(
+        [r['status'] == 'success' for r in results], '✅ Success', '❌ Not Found'
+    )
+    results_df = pd.DataFrame(columns)
+    
+    # Only send the rows the user has asked to see; large AI exports otherwise
+    # re-serialize thousands of rows on every rerun
+    show_rows_key = f"{key_prefix}_show_rows"
+    show_rows = st.session_state.get(show_rows_key, RESULTS_PAGE_ROWS)
+    st.dataframe(
+        results_df.head(show_rows).convert_dtypes(dtype_backend='pyarrow'),
+        use_container_width=True,
+        hide_index=True
+    )
+    if len(results_df) > show_rows:
+        st.caption(f"Showing {show_rows} of {len(results_df)} hackathons")
+        st.button(
+            "Show more",
+            key=f"{key_prefix}_show_more",
+            on_click=st.session_state.__setitem__,
+            args=(show_rows_key, show_rows + RESULTS_PAGE_ROWS)
+        )
+    
+    st.markdown("---")
+    
+    # Export section - build Excel in memory (cached per run) and provide direct download
+    st.markdown("### 💾 Export All AI Hackathon Samples" if ai_export else "### 💾 Export All Samples")
+    
+    # Sheets are only assembled when the cached workbook for this run is missing
+    def export_sheets():
+        # Combine all samples into one DataFrame, tagging rows with their
+        # hackathon through concat keys rather than copying each sample
+        sampled = [
+            r for r in results
+            if r['status'] == 'success' and r['sample_path']
+        ]
+        
+        if sampled:
+            combined_samples = pd.concat(
+                [pd.read_parquet(r['sample_path'], engine='pyarrow') for r in sampled],
+                keys=[(r['url'], r['slug']) for r in sampled],
+                names=['Hackathon URL', 'Hackathon Slug']
+            ).reset_index(level=[0, 1]).reset_index(drop=True)
+        else:
+            combined_samples = pd.DataFrame()
+        
+        # Create summary DataFrame straight from the result records
+        summary_columns = {
+            'url': 'Hackathon URL',
+            'slug': 'Hackathon Slug',
+            'hackathon_name': 'Hackathon Name',
+            'organization': 'Organization',
+            'total_submissions': 'Total Submissions',
+            'sample_size': 'Exported Count' if ai_export else 'Sample Size',
+        }
+        if ai_export:
+            summary_columns['submission_bucket'] = 'Submission Bucket'
+            summary_columns['hackathon_year'] = 'Hackathon Year'
+        summary_columns['status'] = 'Status'
+        summary_columns['error'] = 'Error'
+        
+        summary_df = pd.DataFrame.from_records(
+            results, columns=list(summary_columns)
+        ).rename(columns=summary_columns)
+        for column in ('Hackathon Name', 'Organization'):
+            summary_df[column] = summary_df[column].fillna('').replace('', 'N/A')
+        
+        # Create statistics DataFrame (a single row)
+        stats_df = pd.DataFrame(
+            [[len(results), success_count, not_found_count, total_samples]],
+            columns=[
+                'Total AI Hackathons Processed' if ai_export else 'Total Hackathons Processed',
+                'Hackathons Found',
+                'Hackathons Not Found',
+                'Total Submissions Exported' if ai_export else 'Total Samples Collected'
+            ]
+        )
+        
+        return [
+            ('All AI Hackathon Samples' if ai_export else 'All Samples', combined_samples),
+            ('Summary', summary_df),
+            ('Statistics', stats_df)
+        ]
+    
+    # View-only sessions never need the export, so the download buttons (and
+    # with them any workbook build) only appear once the user asks for them
+    prepare_key = f"{key_prefix}_prepare_export"
+    if not st.session_state.get(prepare_key):
+        st.button(
+            "📦 Prepare Excel Download",
+            key=f"{key_prefix}_prepare",
+            on_click=st.session_state.__setitem__,
+            args=(prepare_key, True)
+        )
+    
+    if st.session_state.get(prepare_key):
+        render_batch_downloads(results_token, timestamp, key_prefix, export_sheets, ai_export)
+    
+    # Option to clear results and start fresh
+    if st.button("🔄 Clear Results & Start Over", key=f"clear_{key_prefix}"):
+        discard_spilled_samples(key_prefix)
+        for key in state_keys:
+            st.session_state.pop(key, None)
+        st.rerun()
+
+def render_batch_downloads(results_token, timestamp, key_prefix, export_sheets, ai_export):
+    """Render the Excel and Parquet download buttons for a finished batch or AI export."""
+    # Provide direct download buttons; the files are only built when clicked
+    file_label = "AI Hackathon Submissions" if ai_export else "All Samples"
+    file_stem = "ai_hackathon_submissions" if ai_export else "batch_random_samples"
+    default_filename = f"{file_stem}_{timestamp}"
+    
+    st.download_button(
+        label=f"📥 Download {file_label} (Excel)",
+        data=partial(build_batch_workbook, results_token, export_sheets),
+        file_name=f"{default_filename}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        key=f"{key_prefix}_download"
+    )
+    
+    # Parquet is far quicker to produce than xlsx for large exports
+    st.download_button(
+        label=f"📥 Download {file_label} (Parquet)",
+        data=partial(build_batch_parquet, results_token, export_sheets),
+        file_name=f"{default_filename}.parquet",
+        mime="application/vnd.apache.parquet",
+        key=f"{key_prefix}_download_parquet"
+    )
+
+def download_gdrive_file(file_id, on_progress=None):
+    """Stream a shared Google Drive file into a spooled temp file and return it rewound.
+    
+    Small archives stay in memory; larger ones spill to disk transparently, so
+    there is no separate download step writing a zip to /tmp first. If given,
+    on_progress is called with the bytes received so far, at most every
+    PROGRESS_INTERVAL seconds.
+    """
+    session = requests.Session()
+    response = session.get(
+        "https://drive.google.com/uc",
+        params={'export': 'download', 'id': file_id},
+        stream=True,
+        timeout=60
+    )
+    response.raise_for_status()
+    
+    # Files too large for Drive's virus scan come back as an HTML confirmation
+    # page instead of the file; resubmit its form to get the real download
+    if 'text/html' in response.headers.get('Content-Type', ''):
+        page = response.text
+        action = re.search(r'<form[^>]*action="([^"]+)"', page)
+        fields = dict(re.findall(r'<input type="hidden" name="([^"]+)" value="([^"]*)"', page))
+        if not action or 'confirm' not in fields:
+            raise ValueError(
+                "Google Drive did not return a file. Make sure it is shared with "
+                "'Anyone with the link' permission."
+            )
+        response = session.get(html.unescape(action.group(1)), params=fields, stream=True, timeout=60)
+        response.raise_for_status()
+    
+    spool = tempfile.SpooledTemporaryFile(max_size=256 * 1024 * 1024)
+    received = 0
+    last_update = 0.0
+    for chunk in response.iter_content(chunk_size=1 << 20):
+        spool.write(chunk)
+        received += len(chunk)
+        if on_progress:
+            now = time.monotonic()
+            if now - last_update >= PROGRESS_INTERVAL:
+                on_progress(received)
+                last_update = now
+    if on_progress:
+        on_progress(received)
+    spool.seek(0)
+    return spool
+
+def extract_zip(zip_ref, extract_dir):
+    """Extract the file members of an open ZipFile, copying them in parallel.
+    
+    Members are streamed with 1 MiB buffers instead of extractall's small
+    default, and decompression runs on a thread pool since zlib releases the GIL.
+    """
+    root = os.path.realpath(extract_dir)
+    targets = []
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        dest = os.path.realpath(os.path.join(root, info.filename))
+        if os.path.commonpath([root, dest]) != root:
+            raise ValueError(f"Refusing to extract {info.filename!r} outside {extract_dir}")
+        targets.append((info, dest))
+    
+    def extract_member(target):
+        info, dest = target
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with zip_ref.open(info) as src, open(dest, 'wb', buffering=1 << 20) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        list(executor.map(extract_member, targets))
+
+def reload_data():
+    """Drop the cached aggregator, sampler and data-derived tables so the next run rereads the data."""
+    get_aggregator.clear()
+    get_sampler.clear()
+    load_data_exists.clear()
+    load_fingerprint.clear()
+    load_hackathons_df.clear()
+    load_batch_preview.clear()
+
 def inject_css():
     """Lazily inject global CSS."""
     from app.ui import inject_global_css
@@ -35,8 +554,14 @@ st.markdown("---")
 aggregator = get_aggregator()
 sampler = get_sampler(aggregator)
 
+# The aggregator and sampler are shared across reruns; this picks up files
+# ingested since they were created without waiting for the cache timeouts
+if st.sidebar.button("🔄 Reload data", help="Reload after uploading or processing new files"):
+    reload_data()
+    st.rerun()
+
 # Check if data exists
-data_available = aggregator.data_exists()
+data_available = load_data_exists(aggregator)
 
 if not data_available:
     st.warning("⚠️ No processed submission data available.")
@@ -58,10 +583,6 @@ if not data_available:
         )
         
         if st.button("📥 Download and Load Data", type="primary", disabled=not gdrive_url):
-            import re
-            import subprocess
-            import zipfile
-            
             # Extract file ID from URL if needed
             file_id = gdrive_url.strip()
             if 'drive.google.com' in file_id:
@@ -69,36 +590,33 @@ if not data_available:
                 if match:
                     file_id = match.group(1)
             
+            download_status = st.empty()
             with st.spinner("Downloading data from Google Drive..."):
                 try:
-                    # Download using gdown
-                    zip_path = "/tmp/submissions_data.zip"
-                    result = subprocess.run(
-                        ["gdown", file_id, "-O", zip_path],
-                        capture_output=True,
-                        text=True,
-                        timeout=300
+                    archive = download_gdrive_file(
+                        file_id,
+                        on_progress=lambda received: download_status.text(
+                            f"Downloaded {received / (1024 * 1024):.1f} MB"
+                        )
                     )
                     
-                    if result.returncode != 0:
-                        st.error(f"Download failed: {result.stderr}")
-                        st.info("Make sure the Google Drive file is shared with 'Anyone with the link' permission.")
-                    else:
-                        # Extract zip file
-                        extract_dir = "./data/submissions/parts"
-                        os.makedirs(extract_dir, exist_ok=True)
-                        
-                        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                            zip_ref.extractall(extract_dir)
-                        
-                        # Clear the cache so the sampler reloads with new data
-                        get_aggregator.clear()
-                        get_sampler.clear()
-                        
-                        st.success("✅ Data loaded successfully! Reloading...")
-                        st.rerun()
-                except subprocess.TimeoutExpired:
+                    # Extract zip file
+                    extract_dir = "./data/submissions/parts"
+                    os.makedirs(extract_dir, exist_ok=True)
+                    
+                    with archive, zipfile.ZipFile(archive, 'r') as zip_ref:
+                        extract_zip(zip_ref, extract_dir)
+                    
+                    # Clear the cache so the sampler reloads with new data
+                    reload_data()
+                    
+                    st.success("✅ Data loaded successfully! Reloading...")
+                    st.rerun()
+                except requests.Timeout:
                     st.error("Download timed out. The file may be too large or the connection is slow.")
+                except (requests.RequestException, ValueError) as e:
+                    st.error(f"Download failed: {e}")
+                    st.info("Make sure the Google Drive file is shared with 'Anyone with the link' permission.")
                 except Exception as e:
                     st.error(f"Error loading data: {e}")
     
@@ -174,15 +692,19 @@ with tab1:
                 )
                 
                 if 'error' in info:
+                    st.session_state.pop('sample_token', None)
                     st.error(f"❌ {info['error']}")
                     
                     # Show search suggestions
                     st.markdown("### 🔍 Did you mean one of these?")
-                    suggestions = sampler.search_hackathons(hackathon_input, limit=10)
+                    suggestions = suggest_hackathons(
+                        load_hackathons_df(sampler, load_fingerprint(aggregator)),
+                        sampler.extract_hackathon_slug(hackathon_input)
+                    )
                     
-                    if suggestions:
-                        for s in suggestions:
-                            st.markdown(f"- **{s['challenge_title']}** ({s['submission_count']} submissions) - `{s['url']}`")
+                    if not suggestions.empty:
+                        for s in suggestions.itertuples(index=False):
+                            st.markdown(f"- **{s.Hackathon}** ({s.Submissions} submissions) - `{s.URL}`")
                     else:
                         st.info("No similar hackathons found. Try a different search term.")
                 else:
@@ -212,53 +734,29 @@ with tab1:
                     
                     # Display sample
                     st.markdown("### 🎯 Random Sample")
-                    st.dataframe(sampled_df, use_container_width=True, hide_index=True)
+                    st.dataframe(
+                        sampled_df.convert_dtypes(dtype_backend='pyarrow'),
+                        use_container_width=True,
+                        hide_index=True
+                    )
                     
                     # Store in session state for export
                     st.session_state['sampled_df'] = sampled_df
                     st.session_state['hackathon_info'] = info
                     st.session_state['random_seed'] = random_seed
-                    
-                    st.markdown("---")
-                    
-                    # Export section
-                    st.markdown("### 💾 Export Sample")
-                    
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        default_filename = f"{info.get('slug', 'hackathon')}_random_sample_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                        export_filename = st.text_input(
-                            "Export Filename:",
-                            value=default_filename,
-                            help="Filename for the exported Excel file"
-                        )
-                    
-                    with col2:
-                        st.markdown("&nbsp;")
-                        st.markdown("&nbsp;")
-                        if st.button("📥 Export to Excel", key="export_sample"):
-                            export_dir = os.getenv('EXPORT_DIR', './data/processed')
-                            os.makedirs(export_dir, exist_ok=True)
-                            output_path = os.path.join(export_dir, export_filename)
-                            
-                            if sampler.export_sample(
-                                hackathon_input, 
-                                output_path, 
-                                sample_size=sample_size,
-                                random_state=random_seed
-                            ):
-                                st.success(f"✅ Exported to: {output_path}")
-                                
-                                with open(output_path, 'rb') as f:
-                                    st.download_button(
-                                        label="⬇️ Download File",
-                                        data=f.read(),
-                                        file_name=export_filename,
-                                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                    )
-                            else:
-                                st.error("❌ Failed to export data")
+                    st.session_state['sample_token'] = uuid.uuid4().hex
+                    st.session_state['sample_timestamp'] = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    # Export section (outside the generate branch so it survives reruns)
+    if 'sample_token' in st.session_state:
+        render_sample_export(
+            sampler,
+            st.session_state['sampled_df'],
+            st.session_state['hackathon_info'],
+            st.session_state['random_seed'],
+            st.session_state['sample_token'],
+            st.session_state['sample_timestamp']
+        )
 
 # ============== BATCH PROCESSING TAB ==============
 with tab2:
@@ -278,30 +776,20 @@ with tab2:
     )
     
     if uploaded_file:
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{uploaded_file.name}"
-        with open(temp_path, 'wb') as f:
-            f.write(uploaded_file.getbuffer())
-        
+        # UploadedFile is an in-memory BytesIO, so pandas and the sampler read
+        # it directly instead of from a copy written to /tmp
         try:
-            # Check if file has Include_in_Sample column
-            temp_df = pd.read_excel(temp_path)
-            has_include_column = 'Include_in_Sample' in temp_df.columns
+            # Header check and preview are cached on the file bytes, so widget
+            # reruns with the same upload skip the Excel parse entirely
+            has_include_column, total_in_file, preview, total_count = load_batch_preview(
+                sampler, uploaded_file.getvalue(), load_fingerprint(aggregator)
+            )
             
             # Set filter parameters
             filter_column = 'Include_in_Sample' if has_include_column else None
             filter_value = 'YES' if has_include_column else None
             
-            # Preview the file with filter applied
-            preview, total_count = sampler.get_batch_preview(
-                temp_path, 
-                limit=10,
-                filter_column=filter_column,
-                filter_value=filter_value
-            )
-            
             if has_include_column:
-                total_in_file = len(temp_df)
                 st.success(f"✅ Found {total_count} hackathons marked for sampling (out of {total_in_file} total in file)")
                 st.info("ℹ️ Only processing hackathons where `Include_in_Sample` = 'YES'")
             else:
@@ -310,7 +798,7 @@ with tab2:
             # Show preview
             st.markdown("#### 📋 Preview (first 10 hackathons)")
             preview_df = pd.DataFrame(preview)
-            preview_df['Status'] = preview_df['found'].apply(lambda x: '✅ Found' if x else '❌ Not in dataset')
+            preview_df['Status'] = np.where(preview_df['found'].to_numpy(bool), '✅ Found', '❌ Not in dataset')
             preview_df = preview_df[['url', 'slug', 'hackathon_name', 'submission_count', 'Status']]
             preview_df.columns = ['URL', 'Slug', 'Hackathon Name', 'Submissions', 'Status']
             st.dataframe(preview_df, use_container_width=True, hide_index=True)
@@ -375,137 +863,48 @@ with tab2:
                 status_text = st.empty()
                 
                 results = []
+                last_update = 0.0
+                spill_dir = new_spill_dir('batch')
+                status_template = "Processing %d/%d: %s %s"
                 
                 # Process hackathons with filter applied
                 for result in sampler.batch_sample_from_file(
-                    temp_path,
+                    uploaded_file,
                     sample_size=batch_sample_size,
                     random_state=batch_random_seed,
                     filter_column=filter_column,
                     filter_value=filter_value,
                     export_all=batch_export_all
                 ):
+                    spill_sample(result, spill_dir)
                     results.append(result)
                     
-                    # Update progress
-                    progress = len(results) / total_count
-                    progress_bar.progress(progress)
-                    
-                    status_icon = "✅" if result['status'] == 'success' else "❌"
-                    status_text.text(f"Processing {len(results)}/{total_count}: {status_icon} {result['slug']}")
+                    # Redraw at most every PROGRESS_INTERVAL seconds, and always for the last item
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_INTERVAL or len(results) == total_count:
+                        progress_bar.progress(len(results) / total_count)
+                        status_icon = "✅" if result['status'] == 'success' else "❌"
+                        status_text.text(status_template % (len(results), total_count, status_icon, result['slug']))
+                        last_update = now
                 
                 progress_bar.progress(1.0)
                 status_text.text(f"✅ Completed processing {total_count} hackathons!")
                 
                 # Store results in session state so they persist across reruns
                 st.session_state['batch_results'] = results
+                st.session_state['batch_results_token'] = batch_results_token(results)
+                st.session_state['batch_timestamp'] = datetime.now().strftime('%Y%m%d_%H%M%S')
                 st.session_state['batch_processed'] = True
             
             # Display results if they exist in session state (persists across reruns)
             if st.session_state.get('batch_results'):
-                results = st.session_state['batch_results']
-                
-                st.markdown("---")
-                st.markdown("### 📊 Processing Results")
-                
-                success_count = sum(1 for r in results if r['status'] == 'success')
-                not_found_count = sum(1 for r in results if r['status'] == 'not_found')
-                total_samples = sum(r['sample_size'] for r in results)
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.metric("Total Hackathons", len(results))
-                
-                with col2:
-                    st.metric("Found in Dataset", success_count)
-                
-                with col3:
-                    st.metric("Not Found", not_found_count)
-                
-                with col4:
-                    st.metric("Total Samples", total_samples)
-                
-                # Show detailed results
-                st.markdown("#### 📋 Detailed Results")
-                
-                results_df = pd.DataFrame([{
-                    'URL': r['url'],
-                    'Hackathon': r['hackathon_name'] or 'N/A',
-                    'Organization': r['organization'] or 'N/A',
-                    'Total Submissions': r['total_submissions'],
-                    'Sampled': r['sample_size'],
-                    'Status': '✅ Success' if r['status'] == 'success' else '❌ Not Found'
-                } for r in results])
-                
-                st.dataframe(results_df, use_container_width=True, hide_index=True)
-                
-                st.markdown("---")
-                
-                # Export section - generate Excel in memory and provide direct download
-                st.markdown("### 💾 Export All Samples")
-                
-                # Generate the Excel file in memory
-                output_buffer = io.BytesIO()
-                
-                # Combine all samples into one DataFrame
-                all_samples = []
-                for r in results:
-                    if r['status'] == 'success' and r['sample_df'] is not None:
-                        sample_df = r['sample_df'].copy()
-                        sample_df['Hackathon URL'] = r['url']
-                        sample_df['Hackathon Slug'] = r['slug']
-                        all_samples.append(sample_df)
-                
-                if all_samples:
-                    combined_samples = pd.concat(all_samples, ignore_index=True)
-                else:
-                    combined_samples = pd.DataFrame()
-                
-                # Create summary DataFrame
-                summary_df = pd.DataFrame([{
-                    'Hackathon URL': r['url'],
-                    'Hackathon Slug': r['slug'],
-                    'Hackathon Name': r['hackathon_name'] or 'N/A',
-                    'Organization': r['organization'] or 'N/A',
-                    'Total Submissions': r['total_submissions'],
-                    'Sample Size': r['sample_size'],
-                    'Status': r['status'],
-                    'Error': r.get('error', '')
-                } for r in results])
-                
-                # Create statistics DataFrame
-                stats_df = pd.DataFrame([{
-                    'Total Hackathons Processed': len(results),
-                    'Hackathons Found': success_count,
-                    'Hackathons Not Found': not_found_count,
-                    'Total Samples Collected': total_samples
-                }])
-                
-                # Write to Excel buffer
-                with pd.ExcelWriter(output_buffer, engine='openpyxl') as writer:
-                    combined_samples.to_excel(writer, sheet_name='All Samples', index=False)
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    stats_df.to_excel(writer, sheet_name='Statistics', index=False)
-                
-                output_buffer.seek(0)
-                
-                # Provide direct download button (no separate export step needed)
-                default_filename = f"batch_random_samples_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                st.download_button(
-                    label="📥 Download All Samples (Excel)",
-                    data=output_buffer,
-                    file_name=default_filename,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key="batch_download"
+                render_batch_results(
+                    st.session_state['batch_results'],
+                    st.session_state['batch_results_token'],
+                    st.session_state['batch_timestamp'],
+                    key_prefix='batch',
+                    state_keys=['batch_results', 'batch_results_token', 'batch_timestamp', 'batch_processed', 'batch_prepare_export', 'batch_show_rows']
                 )
-                
-                # Option to clear results and start fresh
-                if st.button("🔄 Clear Results & Start Over", key="clear_batch"):
-                    del st.session_state['batch_results']
-                    if 'batch_processed' in st.session_state:
-                        del st.session_state['batch_processed']
-                    st.rerun()
         
         except Exception as e:
             st.error(f"❌ Error loading file: {e}")
@@ -513,11 +912,13 @@ with tab2:
 
 # ============== AI HACKATHON EXPORT TAB ==============
 with tab3:
+    ai_hackathon_count = load_ai_hackathons_count(sampler)
+    
     st.markdown("### Export AI/ML Hackathon Submissions")
     st.markdown("""
     Export submission data from all AI/ML hackathons in the built-in list.
     This list contains **{:,}** hackathons focused on AI, ML, and related technologies.
-    """.format(sampler.get_ai_hackathons_count()))
+    """.format(ai_hackathon_count))
     
     # Check if submission data is available
     if not data_available:
@@ -527,8 +928,6 @@ with tab3:
         st.markdown("The AI hackathons list is ready, but without submission data, there's nothing to export.")
     
     # Check if AI hackathons list exists
-    ai_hackathon_count = sampler.get_ai_hackathons_count()
-    
     if ai_hackathon_count == 0:
         st.warning("⚠️ No AI hackathons list found. Please ensure the ai_hackathons_list.xlsx file is in the data directory.")
     elif data_available:
@@ -591,6 +990,9 @@ with tab3:
             status_text = st.empty()
             
             results = []
+            last_update = 0.0
+            spill_dir = new_spill_dir('ai')
+            status_template = "Processing %d/%d: %s %s"
             
             # Process AI hackathons
             for result in sampler.batch_sample_ai_hackathons(
@@ -598,130 +1000,36 @@ with tab3:
                 random_state=ai_random_seed,
                 export_all=ai_export_all
             ):
+                spill_sample(result, spill_dir)
                 results.append(result)
                 
-                # Update progress
-                progress = len(results) / ai_hackathon_count
-                progress_bar.progress(progress)
-                
-                status_icon = "✅" if result['status'] == 'success' else "❌"
-                status_text.text(f"Processing {len(results)}/{ai_hackathon_count}: {status_icon} {result['slug']}")
+                # Redraw at most every PROGRESS_INTERVAL seconds, and always for the last item
+                now = time.monotonic()
+                if now - last_update >= PROGRESS_INTERVAL or len(results) == ai_hackathon_count:
+                    progress_bar.progress(len(results) / ai_hackathon_count)
+                    status_icon = "✅" if result['status'] == 'success' else "❌"
+                    status_text.text(status_template % (len(results), ai_hackathon_count, status_icon, result['slug']))
+                    last_update = now
             
             progress_bar.progress(1.0)
             status_text.text(f"✅ Completed processing {ai_hackathon_count} AI hackathons!")
             
             # Store results in session state
             st.session_state['ai_batch_results'] = results
+            st.session_state['ai_batch_results_token'] = batch_results_token(results)
+            st.session_state['ai_batch_timestamp'] = datetime.now().strftime('%Y%m%d_%H%M%S')
             st.session_state['ai_batch_processed'] = True
         
         # Display results if they exist in session state
         if st.session_state.get('ai_batch_results'):
-            results = st.session_state['ai_batch_results']
-            
-            st.markdown("---")
-            st.markdown("### 📊 Processing Results")
-            
-            success_count = sum(1 for r in results if r['status'] == 'success')
-            not_found_count = sum(1 for r in results if r['status'] == 'not_found')
-            total_samples = sum(r['sample_size'] for r in results)
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total AI Hackathons", len(results))
-            
-            with col2:
-                st.metric("Found in Dataset", success_count)
-            
-            with col3:
-                st.metric("Not Found", not_found_count)
-            
-            with col4:
-                st.metric("Total Submissions", total_samples)
-            
-            # Show detailed results
-            st.markdown("#### 📋 Detailed Results")
-            
-            results_df = pd.DataFrame([{
-                'URL': r['url'],
-                'Hackathon': r['hackathon_name'] or 'N/A',
-                'Organization': r['organization'] or 'N/A',
-                'Total Submissions': r['total_submissions'],
-                'Exported': r['sample_size'],
-                'Bucket': r.get('submission_bucket', 'N/A'),
-                'Status': '✅ Success' if r['status'] == 'success' else '❌ Not Found'
-            } for r in results])
-            
-            st.dataframe(results_df, use_container_width=True, hide_index=True)
-            
-            st.markdown("---")
-            
-            # Export section
-            st.markdown("### 💾 Export All AI Hackathon Samples")
-            
-            # Generate the Excel file in memory
-            output_buffer = io.BytesIO()
-            
-            # Combine all samples into one DataFrame
-            all_samples = []
-            for r in results:
-                if r['status'] == 'success' and r['sample_df'] is not None:
-                    sample_df = r['sample_df'].copy()
-                    sample_df['Hackathon URL'] = r['url']
-                    sample_df['Hackathon Slug'] = r['slug']
-                    all_samples.append(sample_df)
-            
-            if all_samples:
-                combined_samples = pd.concat(all_samples, ignore_index=True)
-            else:
-                combined_samples = pd.DataFrame()
-            
-            # Create summary DataFrame
-            summary_df = pd.DataFrame([{
-                'Hackathon URL': r['url'],
-                'Hackathon Slug': r['slug'],
-                'Hackathon Name': r['hackathon_name'] or 'N/A',
-                'Organization': r['organization'] or 'N/A',
-                'Total Submissions': r['total_submissions'],
-                'Exported Count': r['sample_size'],
-                'Submission Bucket': r.get('submission_bucket', ''),
-                'Hackathon Year': r.get('hackathon_year', ''),
-                'Status': r['status'],
-                'Error': r.get('error', '')
-            } for r in results])
-            
-            # Create statistics DataFrame
-            stats_df = pd.DataFrame([{
-                'Total AI Hackathons Processed': len(results),
-                'Hackathons Found': success_count,
-                'Hackathons Not Found': not_found_count,
-                'Total Submissions Exported': total_samples
-            }])
-            
-            # Write to Excel buffer
-            with pd.ExcelWriter(output_buffer, engine='openpyxl') as writer:
-                combined_samples.to_excel(writer, sheet_name='All AI Hackathon Samples', index=False)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                stats_df.to_excel(writer, sheet_name='Statistics', index=False)
-            
-            output_buffer.seek(0)
-            
-            # Provide direct download button
-            default_filename = f"ai_hackathon_submissions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            st.download_button(
-                label="📥 Download AI Hackathon Submissions (Excel)",
-                data=output_buffer,
-                file_name=default_filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key="ai_download"
+            render_batch_results(
+                st.session_state['ai_batch_results'],
+                st.session_state['ai_batch_results_token'],
+                st.session_state['ai_batch_timestamp'],
+                key_prefix='ai',
+                state_keys=['ai_batch_results', 'ai_batch_results_token', 'ai_batch_timestamp', 'ai_batch_processed', 'ai_prepare_export', 'ai_show_rows'],
+                ai_export=True
             )
-            
-            # Option to clear results and start fresh
-            if st.button("🔄 Clear Results & Start Over", key="clear_ai"):
-                del st.session_state['ai_batch_results']
-                if 'ai_batch_processed' in st.session_state:
-                    del st.session_state['ai_batch_processed']
-                st.rerun()
 
 st.markdown("---")
 
@@ -729,28 +1037,26 @@ st.markdown("---")
 st.markdown("### 🔍 Browse Available Hackathons")
 
 with st.expander("View all hackathons in the dataset"):
-    hackathons = sampler.get_available_hackathons()
+    fingerprint = load_fingerprint(aggregator)
+    all_hackathons_df = load_hackathons_df(sampler, fingerprint)
     
-    if hackathons:
+    if not all_hackathons_df.empty:
         # Search filter
         search_query = st.text_input(
             "Filter hackathons:",
             placeholder="Type to filter...",
             key="hackathon_search"
-        )
+        ).strip()
         
-        if search_query:
-            filtered = sampler.search_hackathons(search_query, limit=50)
+        # Single characters match nearly everything, so only search from two on
+        if len(search_query) >= 2:
+            hackathon_df = search_hackathons_df(all_hackathons_df, search_query)
         else:
-            filtered = hackathons[:50]  # Show top 50 by default
+            hackathon_df = all_hackathons_df.head(50)  # Show top 50 by default
         
-        if filtered:
-            hackathon_df = pd.DataFrame(filtered)
-            hackathon_df = hackathon_df[['challenge_title', 'organization', 'submission_count', 'url']]
-            hackathon_df.columns = ['Hackathon', 'Organization', 'Submissions', 'URL']
-            
-            st.dataframe(hackathon_df, use_container_width=True, hide_index=True)
-            st.caption(f"Showing {len(filtered)} of {len(hackathons)} hackathons")
+        if not hackathon_df.empty:
+            st.dataframe(hackathon_df[HACKATHON_COLUMNS], use_container_width=True, hide_index=True)
+            st.caption(f"Showing {len(hackathon_df)} of {len(all_hackathons_df)} hackathons")
         else:
             st.info("No hackathons match your search.")
     else:
@@ -27,6 +27,24 @@ def get_aggregator():
     from app.aggregate import DataAggregator
     return DataAggregator()
 
+@st.cache_data(ttl=5, show_spinner=False)
+def load_fingerprint(_aggregator):
+    """Stat the data files at most every few seconds rather than on every rerun."""
+    return _aggregator.data_fingerprint()
+
+@st.cache_data(ttl=60, show_spinner=False, max_entries=2)
+def load_summary(_aggregator, fingerprint):
+    """Compute the quick statistics once per data fingerprint.
+    
+    Only the current fingerprint is ever read, so older ones are evicted.
+    """
+    return _aggregator.get_summary_statistics()
+
+@st.cache_data(ttl=10, show_spinner=False)
+def load_db_stats(_db):
+    """Query the job counts at most every few seconds."""
+    return _db.get_summary_stats()
+
 def inject_css():
     """Lazily inject global CSS."""
     from app.ui import inject_global_css
@@ -61,7 +79,7 @@ st.markdown("---")
 if aggregator.data_exists():
     st.subheader("📈 Quick Statistics")
     
-    summary = aggregator.get_summary_statistics()
+    summary = load_summary(aggregator, load_fingerprint(aggregator))
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -116,7 +134,7 @@ else:
 
 st.markdown("---")
 
-db_stats = db.get_summary_stats()
+db_stats = load_db_stats(db)
 
 st.subheader("🗄️ Database Statistics")
 